@@ -0,0 +1,199 @@
+"""On-disk performance baselines for `run.py`.
+
+Timing records are stored in a JSON file, keyed by solver, input hash and git
+revision:
+
+    {
+        "day_6/part_2": {
+            "<input sha256>": {
+                "<git revision>": {"recorded_at": ..., "timing": {...}}
+            }
+        }
+    }
+
+`compare` checks a run against the most recently recorded baseline for the
+same solver + input and flags anything that got slower than its threshold, or
+(for runs traced with `--memory`) whose peak memory grew past it. Differences
+under a metric's minimum (1ms, 1MiB) are never flagged: at that scale the ratio
+is noise.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import datetime
+import json
+import os
+import subprocess
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.10
+
+# Per-solver overrides of the default allowed slowdown (fraction of the baseline
+# median). The long-running, known-pathological solvers are stable enough to hold
+# to a tighter limit. An explicit threshold passed to `compare` overrides these.
+THRESHOLDS: Dict[Tuple[int, int], float] = {
+    (6, 2): 0.05,
+    (9, 2): 0.05,
+    (18, 2): 0.05,
+    (20, 2): 0.05,
+}
+
+Store = Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]
+
+# metric -> (how to read it from a timing record, unit, unit size)
+METRICS: Dict[str, Tuple[Callable[[Dict[str, Any]], Optional[float]], str, float]] = {
+    "time": (lambda timing: timing["median"], "ms", 1e6),
+    "memory": (lambda timing: (timing.get("memory") or {}).get("peak"), "MiB", 2**20),
+}
+
+# metric -> smallest absolute growth that can count as a regression, in units
+MIN_DIFFERENCE: Dict[str, float] = {
+    "time": 1.0,
+    "memory": 1.0,
+}
+
+
+def git_revision() -> str:
+    """Current HEAD, with a `-dirty` suffix when the tree has local changes"""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=cwd, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=cwd, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    return f"{rev}-dirty" if dirty else rev
+
+
+def solver_key(day: int, part: int) -> str:
+    return f"day_{day}/part_{part}"
+
+
+def load(path: str = DEFAULT_PATH) -> Store:
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(store: Store, path: str = DEFAULT_PATH):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(store, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def record(store: Store, day: int, part: int, input_sha256: str, revision: str, timing: Dict[str, Any]):
+    """Add (or replace) the baseline for a solver/input at a revision"""
+    (
+        store
+        .setdefault(solver_key(day, part), {})
+        .setdefault(input_sha256, {})
+    )[revision] = {
+        "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "timing": timing,
+    }
+
+
+def latest(store: Store, day: int, part: int, input_sha256: str, exclude: Optional[str] = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Most recently recorded (revision, entry) for a solver/input"""
+    revisions = store.get(solver_key(day, part), {}).get(input_sha256, {})
+    candidates = [(rev, entry) for rev, entry in revisions.items() if rev != exclude]
+    if not candidates:
+        return None
+
+    return max(candidates, key=lambda c: c[1]["recorded_at"])
+
+
+@dataclass
+class Comparison:
+    day: int
+    part: int
+    input_file: str
+    revision: str
+    baseline: float
+    current: float
+    threshold: float
+    metric: str = "time"
+    # in the metric's units
+    min_difference: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    @property
+    def regressed(self) -> bool:
+        _, _, size = METRICS[self.metric]
+        return (
+            self.ratio > 1 + self.threshold
+            and (self.current - self.baseline) / size >= self.min_difference
+        )
+
+    def __str__(self):
+        _, unit, size = METRICS[self.metric]
+        flag = ("SLOWER" if self.metric == "time" else "BIGGER") if self.regressed else "ok"
+        return (f"{flag:6} {solver_key(self.day, self.part)} {self.input_file} {self.metric}: "
+                f"{self.baseline / size:.3f}{unit} @ {self.revision} -> {self.current / size:.3f}{unit} "
+                f"({(self.ratio - 1) * 100:+.1f}%, limit +{self.threshold * 100:.0f}%)")
+
+
+def compare(
+    store: Store,
+    results: List[Any],
+    threshold: Optional[float] = None,
+    thresholds: Optional[Dict[Tuple[int, int], float]] = None,
+    exclude: Optional[str] = None,
+    min_difference: Optional[Dict[str, float]] = None,
+) -> List[Comparison]:
+    """Compare `run.Result`s against the stored baselines, using the median timing
+    and, where both sides were traced, the peak memory.
+    Results without a baseline (new solver or changed input), or served from
+    the result cache, are skipped.
+
+    An explicit `threshold` applies to every solver. Without one, `thresholds`
+    (default `THRESHOLDS`) is consulted first, then `DEFAULT_THRESHOLD`.
+    """
+    if threshold is not None:
+        default, thresholds = threshold, {}
+    else:
+        default, thresholds = DEFAULT_THRESHOLD, THRESHOLDS if thresholds is None else thresholds
+    min_difference = MIN_DIFFERENCE if min_difference is None else min_difference
+
+    comparisons = []
+    for r in results:
+        if not r.ok or not r.timing or r.timing.get("cached"):
+            continue
+
+        found = latest(store, r.day, r.part, r.input_sha256, exclude=exclude)
+        if found is None:
+            continue
+
+        revision, entry = found
+        for metric, (value, _, _) in METRICS.items():
+            before, after = value(entry["timing"]), value(r.timing)
+            if before is None or after is None:
+                continue
+
+            comparisons.append(Comparison(
+                day=r.day,
+                part=r.part,
+                input_file=r.input_file,
+                revision=revision,
+                baseline=before,
+                current=after,
+                threshold=thresholds.get((r.day, r.part), default),
+                metric=metric,
+                min_difference=min_difference.get(metric, 0.0),
+            ))
+
+    return comparisons
@@ -0,0 +1,85 @@
+"""Run one solver over many inputs, from a single process.
+
+The solver is imported once, and its static tables (day 21's keypad paths,
+day 22's secret-number tables, day 17's compiled programs, ...) are built once
+and shared by every input. Answers are streamed as they're found.
+
+    python batch.py 22 1 inputs/*.txt          # one line per input: <file> <answer>
+    python batch.py 17 2 inputs/ --quiet       # every file in a directory, just the answers
+"""
+from __future__ import annotations
+
+import argparse
+from contextlib import redirect_stdout
+import importlib
+import os
+import sys
+import time
+from typing import Any, Generator, Iterable, List, Optional, Tuple
+
+from run import KWARGS, ROOT
+from utils import batch, read_input
+
+
+def expand(paths: Iterable[str]) -> List[str]:
+    """Files as given, directories as every file in them (sorted)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if os.path.isfile(os.path.join(path, name))
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def solve(day: int, part: int, files: Iterable[str], **kwargs) -> Generator[Tuple[str, Any], None, None]:
+    """(file, answer) for each input file, as each one is solved"""
+    module = importlib.import_module(f"day_{day}.part_{part}")
+    # same extra arguments as the real input gets in `run.py`
+    kwargs = {**KWARGS.get((day, part, ""), lambda _: {})(module), **kwargs}
+
+    files = list(files)
+    answers = batch(module.main, (read_input(fp) for fp in files), **kwargs)
+
+    with open(os.devnull, "w") as devnull:
+        for fp in files:
+            # the solvers' debug printing would drown out the answers
+            with redirect_stdout(devnull):
+                answer = next(answers)
+            yield fp, answer
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("day", type=int)
+    parser.add_argument("part", type=int, choices=(1, 2))
+    parser.add_argument("inputs", nargs="+", help="input files, or directories of them")
+    parser.add_argument("--quiet", action="store_true", help="only print the answers")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    # absolute path -> as given
+    files = {os.path.abspath(fp): fp for fp in expand(args.inputs)}
+
+    # solvers expect to be run from within their own day directory
+    os.chdir(os.path.join(ROOT, f"day_{args.day}"))
+
+    start = time.perf_counter()
+    n = 0
+    for fp, answer in solve(args.day, args.part, files):
+        print(answer if args.quiet else f"{files[fp]} {answer}", flush=True)
+        n += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{n} inputs in {elapsed:.3f}s ({elapsed / max(n, 1) * 1000:.3f}ms each)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,266 @@
+"""Content-addressed on-disk cache for solver results.
+
+A result is keyed on the SHA-256 of the solver module's source, and of every
+repo-local module it imports (`grid`, `coord`, ...), plus the arguments it was
+called with (the input data, as bytes), so editing the solver, a helper it uses,
+or changing the input all miss. Entries are pickled into `path`, one file per
+key, and the least recently used ones are evicted once the directory grows past
+`max_bytes`.
+
+Opt-in: nothing is cached unless a `caching()` block is active, the
+`AOC_CACHE` env var is set (`1` for the default directory, or a path), or
+`run.py --cache` is used.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import os
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from lazy import lazy_import
+
+# not needed at all unless caching is turned on
+ast = lazy_import("ast")
+hashlib = lazy_import("hashlib")
+inspect = lazy_import("inspect")
+pickle = lazy_import("pickle")
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(ROOT, ".cache", "results")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+MISSING = object()
+
+
+def _as_bytes(value: Any) -> bytes:
+    if isinstance(value, str):
+        return value.encode()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    try:
+        return bytes(memoryview(value))  # mmap, arrays, ...
+    except TypeError:
+        return repr(value).encode()
+
+
+def _module_file(directory: str, name: str) -> Optional[str]:
+    path = os.path.join(directory, *name.split("."))
+    for candidate in (f"{path}.py", os.path.join(path, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def local_imports(fp: str, source: bytes) -> List[str]:
+    """Files of the repo-local modules the module at fp imports (anywhere in it).
+    Anything not found under the repo root or next to fp (the stdlib, NumPy)
+    is left out."""
+    try:
+        tree = ast.parse(source, fp)
+    except (SyntaxError, ValueError):
+        return []
+
+    here = os.path.dirname(fp)
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names, directories = [alias.name for alias in node.names], (ROOT, here)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            # `from pkg import module` can name modules too
+            names = [base] + [f"{base}.{alias.name}".lstrip(".") for alias in node.names]
+            directories = (ROOT, here)
+            if node.level:
+                directory = here
+                for _ in range(node.level - 1):
+                    directory = os.path.dirname(directory)
+                directories = (directory,)
+        else:
+            continue
+
+        for name in names:
+            for directory in directories:
+                path = _module_file(directory, name) if name else None
+                if path is not None and os.path.abspath(path).startswith(ROOT):
+                    found.append(os.path.abspath(path))
+    return list(dict.fromkeys(found))
+
+
+class ResultCache:
+    def __init__(self, path: str = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._sources: Dict[str, Optional[str]] = {}
+
+    def source_hash(self, f) -> Optional[str]:
+        """SHA-256 of the file f is defined in and of the repo-local modules it
+        imports, transitively. None if f has no source file."""
+        try:
+            fp = inspect.getsourcefile(f)
+        except TypeError:
+            return None  # builtins
+
+        if fp not in self._sources:
+            try:
+                self._sources[fp] = self._tree_hash(os.path.abspath(fp))
+            except (OSError, TypeError):
+                self._sources[fp] = None  # defined interactively
+        return self._sources[fp]
+
+    def _tree_hash(self, fp: str) -> str:
+        h = hashlib.sha256()
+        seen = set()
+        pending = [fp]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+
+            with open(path, "rb") as src:
+                source = src.read()
+            # the entry module first, then its dependencies in path order
+            h.update(hashlib.sha256(source).digest())
+            pending.extend(sorted(set(local_imports(path, source)) - seen, reverse=True))
+        return h.hexdigest()
+
+    def key(
+        self,
+        f,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        files: Tuple[str, ...] = (),
+    ) -> Optional[str]:
+        """Cache key for calling f with args, None if f can't be cached.
+
+        `files` names the arguments of f that are paths to its input. For those
+        the key covers the file itself (its inode, size and mtime), not just the
+        path, so rewriting the file misses.
+        """
+        source = self.source_hash(f)
+        if source is None:
+            return None
+
+        h = hashlib.sha256(source.encode())
+        h.update(f.__qualname__.encode())
+        for arg in args:
+            # length-prefixed, so ("ab", "c") and ("a", "bc") differ
+            data = _as_bytes(arg)
+            h.update(len(data).to_bytes(8, "little"))
+            h.update(data)
+        for name in sorted(kwargs):
+            h.update(f"{name}={kwargs[name]!r}".encode())
+
+        if files:
+            bound = inspect.signature(f).bind(*args, **kwargs).arguments
+            for name in files:
+                if bound.get(name) is None:
+                    continue
+                try:
+                    st = os.stat(bound[name])
+                except (OSError, TypeError):
+                    return None  # not a file (yet), leave it to f
+                h.update(f"{name}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}".encode())
+
+        return h.hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.pkl")
+
+    def get(self, key: str) -> Any:
+        """The cached result for key, or `MISSING`"""
+        fp = self._file(key)
+        try:
+            with open(fp, "rb") as f:
+                result = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return MISSING
+
+        # bump the mtime, it's what eviction goes by
+        try:
+            os.utime(fp)
+        except FileNotFoundError:
+            return MISSING  # evicted by another process in between
+        return result
+
+    def put(self, key: str, result: Any):
+        fp = self._file(key)
+        try:
+            data = pickle.dumps(result)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # not cacheable, just recompute next time
+
+        os.makedirs(os.path.dirname(fp), exist_ok=True)
+        tmp = f"{fp}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, fp)
+
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) of every cached result"""
+        found = []
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if not name.endswith(".pkl"):
+                    continue
+                fp = os.path.join(root, name)
+                try:
+                    st = os.stat(fp)
+                except OSError:
+                    continue  # evicted by another process
+                found.append((st.st_mtime_ns, st.st_size, fp))
+        return found
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, fp in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(fp)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, fp in self.entries():
+            os.remove(fp)
+
+
+def _cache_from_env() -> Optional[ResultCache]:
+    """`AOC_CACHE=1` caches to the default directory, `AOC_CACHE=<path>` to path.
+    `AOC_CACHE_MAX_MB` bounds its size."""
+    raw = os.environ.get("AOC_CACHE")
+    if not raw or raw == "0":
+        return None
+
+    max_mb = os.environ.get("AOC_CACHE_MAX_MB")
+    return ResultCache(
+        path=DEFAULT_PATH if raw == "1" else raw,
+        max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES,
+    )
+
+
+active: Optional[ResultCache] = _cache_from_env()
+
+
+@contextmanager
+def caching(
+    path: str = DEFAULT_PATH,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Generator[ResultCache, None, None]:
+    """Serve every `time_it`-decorated function from the result cache
+    for the duration of the block."""
+    global active
+
+    previous = active
+    active = ResultCache(path=path, max_bytes=max_bytes)
+    try:
+        yield active
+    finally:
+        active = previous
@@ -0,0 +1,59 @@
+"""Shared, immutable 2D coordinate.
+
+A `NamedTuple`, so it has no per-instance `__dict__`, and hashing/equality
+are the C-level tuple ones instead of building a fresh tuple per lookup.
+Unit directions are interned module constants (increasing y goes down, like
+list indexing), and turning/inverting them hands back those same objects.
+
+For set/dict keys on a known-width grid, `pack` encodes a coordinate as a
+single small int (`y * width + x`), `Coord.unpack` reverses it.
+"""
+from __future__ import annotations
+
+from typing import Dict, NamedTuple, Tuple
+
+
+class Coord(NamedTuple):
+    x: int
+    y: int
+
+    def move(self, direction: Coord, n: int = 1) -> Coord:
+        return Coord(self.x + direction.x * n, self.y + direction.y * n)
+
+    @property
+    def pivot_right(self) -> Coord:
+        # always around 0,0. Clockwise on screen, since y goes down
+        return _RIGHT_OF.get(self) or Coord(-self.y, self.x)
+
+    @property
+    def pivot_left(self) -> Coord:
+        return _LEFT_OF.get(self) or Coord(self.y, -self.x)
+
+    @property
+    def inverse(self) -> Coord:
+        return _INVERSE.get(self) or Coord(-self.x, -self.y)
+
+    def distance(self, other: Coord) -> int:
+        return abs(self.x - other.x) + abs(self.y - other.y)
+
+    def pack(self, width: int) -> int:
+        return self.y * width + self.x
+
+    @classmethod
+    def unpack(cls, i: int, width: int) -> Coord:
+        y, x = divmod(i, width)
+        return cls(x, y)
+
+
+UP = Coord(0, -1)
+RIGHT = Coord(1, 0)
+DOWN = Coord(0, 1)
+LEFT = Coord(-1, 0)
+
+# clockwise, starting from up
+DIRECTIONS: Tuple[Coord, Coord, Coord, Coord] = (UP, RIGHT, DOWN, LEFT)
+DIAGONALS: Tuple[Coord, Coord, Coord, Coord] = (Coord(-1, -1), Coord(1, -1), Coord(1, 1), Coord(-1, 1))
+
+_RIGHT_OF: Dict[Coord, Coord] = {d: DIRECTIONS[(i + 1) % 4] for i, d in enumerate(DIRECTIONS)}
+_LEFT_OF: Dict[Coord, Coord] = {d: DIRECTIONS[(i - 1) % 4] for i, d in enumerate(DIRECTIONS)}
+_INVERSE: Dict[Coord, Coord] = {d: DIRECTIONS[(i + 2) % 4] for i, d in enumerate(DIRECTIONS)}
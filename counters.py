@@ -0,0 +1,46 @@
+"""Work counters for the search solvers.
+
+Timings alone can't tell an algorithmic win (fewer nodes expanded) from a
+constant-factor one (same nodes, cheaper each). Solvers bump counters on their
+hot paths, but only while a `counting()` block is active:
+
+    stats = counters.active
+    ...
+    if stats is not None:
+        stats["expanded"] += 1
+
+When nothing is counting `active` is `None`, so the cost is a single `is not
+None` check on a local. The usual names are `expanded` (nodes/states taken off
+the frontier), `frontier_peak`, `pruned` (branches cut) and `cache_hits`.
+
+`time_it` collects them per call with `benchmarking(counters=True)`,
+`AOC_COUNTERS=1` or `run.py --counters`.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Generator, Optional
+
+
+class Counters(Counter):
+    def peak(self, name: str, value: int):
+        """Keep the largest value seen for name"""
+        if value > self[name]:
+            self[name] = value
+
+
+active: Optional[Counters] = None
+
+
+@contextmanager
+def counting() -> Generator[Counters, None, None]:
+    """Collect counters from every instrumented solver for the duration of the block"""
+    global active
+
+    previous = active
+    active = Counters()
+    try:
+        yield active
+    finally:
+        active = previous
@@ -1,34 +1,109 @@
-import re
+from operator import sub
+import os
+import sys
+from typing import Generator, List, Optional, Tuple
+import warnings
 
+from lazy import lazy_import
 from utils import time_it, read_input, input_path
 
+np = lazy_import("numpy")
+# only for `external`
+heapq = lazy_import("heapq")
+tempfile = lazy_import("tempfile")
 
-pattern = re.compile(r'^(?P<n1>\d+)\s+(?P<n2>\d+)?$')
 
+def columns(data: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Both location lists, parsed in one pass.
 
-@time_it
-def main(data: str) -> str:
+    Each line in the input is like: `123   456`, so the whole input is just
+    whitespace separated ints, alternating between the two columns.
+    """
+    with warnings.catch_warnings():
+        # numpy only warns when it can't read to the end (for now)
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(data, dtype=np.int64, sep=" ")
+        except (DeprecationWarning, ValueError):
+            raise Exception("Bad Pattern, not all whitespace separated numbers")
+
+    # the right number of values isn't enough (`3 4 5\n6`), count them per line:
+    # a value starts wherever a non-blank byte follows a blank one (whitespace
+    # and control bytes are all <= 32)
+    text = np.frombuffer(data.encode(), dtype=np.uint8)
+    blank = text <= 32
+    starts = ~blank
+    starts[1:] &= blank[:-1]
+    # every line has at least its own newline byte, so none is empty
+    line_starts = np.concatenate(([0], np.flatnonzero(text == 10) + 1))
+    line_starts = line_starts[line_starts < len(text)]
+    per_line = np.add.reduceat(starts, line_starts, dtype=np.int64) if len(text) else line_starts
+    if (per_line != 2).any():
+        raise Exception("Bad Pattern, expected two numbers on every line")
 
-    # Each line in the input is like: `123   456`
     # Treat it like a matrix having two columns (vectors), v1 and v2
-    v1, v2 = [], []
-    for line in data.splitlines():
-        m = pattern.match(line)
-        if not m:
-            raise Exception("Bad Pattern, ", line)
+    pairs = values.reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
 
-        n1, n2 = m.group("n1"), m.group("n2")
-        v1.append(int(n1)), v2.append(int(n2))
+
+@time_it
+def main(data: str) -> int:
+    v1, v2 = columns(data)
 
     # sort v1 and v2 and sum up the absolute distances between pairs
-    distance = 0
-    for l, r in zip(sorted(v1), sorted(v2)):
-        d = abs(l - r)
-        distance += d
+    return int(np.abs(np.sort(v1) - np.sort(v2)).sum())
+
+
+def chunks(fp: str, size: int) -> Generator[bytes, None, None]:
+    """The file in roughly `size` byte pieces, only ever split between lines"""
+    with open(fp, "rb") as f:
+        rest = b""
+        while block := f.read(size):
+            block = rest + block
+            cut = block.rfind(b"\n") + 1
+            rest, block = block[cut:], block[:cut]
+            if block:
+                yield block
+
+        if rest.strip():
+            yield rest
+
+
+def read_run(fp: str, block: int) -> Generator[int, None, None]:
+    """A spilled, sorted run, read back `block` values at a time"""
+    with open(fp, "rb") as f:
+        while len(values := np.fromfile(f, dtype=np.int64, count=block)):
+            yield from values.tolist()
+
+
+@time_it(files=("fp",))
+def external(fp: str, chunk_size: int = 64 * 2**20, tmp_dir: Optional[str] = None) -> int:
+    """Same as `main`, for inputs that don't fit in memory.
+
+    An external merge sort: every `chunk_size` bytes of input are parsed, both
+    columns sorted and spilled to temp files as a run. Then the runs of each
+    column are k-way merged, and the two merged columns walked in lockstep to sum
+    up the distances. Peak memory is a few times `chunk_size`, plus a small read
+    buffer per run.
+    """
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        runs: Tuple[List[str], List[str]] = ([], [])
+        for i, chunk in enumerate(chunks(fp, chunk_size)):
+            for side, (column, values) in enumerate(zip(runs, columns(chunk.decode()))):
+                column.append(os.path.join(tmp, f"{side}_{i}.bin"))
+                np.sort(values).tofile(column[-1])
+
+        # split the read buffers between the runs, so they stay within chunk_size too
+        block = max(chunk_size // 8 // max(2 * len(runs[0]), 1), 1024)
+        v1, v2 = (heapq.merge(*(read_run(run, block) for run in column)) for column in runs)
 
-    return distance
+        return sum(map(abs, map(sub, v1, v2)))
 
 
 if __name__ == "__main__":
-    print(main(read_input(input_path(__file__).replace(".txt", "_practice.txt"))))
-    print(main(read_input(input_path(__file__))))
+    if len(sys.argv) > 1:
+        # python part_1.py <huge input> [chunk MiB]
+        print(external(sys.argv[1], chunk_size=int(float(sys.argv[2]) * 2**20) if len(sys.argv) > 2 else 64 * 2**20))
+    else:
+        print(main(read_input(input_path(__file__).replace(".txt", "_practice.txt"))))
+        print(main(read_input(input_path(__file__))))
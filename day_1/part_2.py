@@ -1,37 +1,131 @@
-from collections import Counter
-import re
+import os
+import sys
+from typing import List, Optional, Tuple
+import warnings
 
+from lazy import lazy_import
 from utils import time_it, read_input, input_path
 
+np = lazy_import("numpy")
+# only for `parallel`
+futures = lazy_import("concurrent.futures")
 
-pattern = re.compile(r'^(?P<n1>\d+)\s+(?P<n2>\d+)?$')
 
+def columns(data: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Both location lists, parsed in one pass.
 
-@time_it
-def main(data: str) -> str:
+    Each line in the input is like: `123   456`, so the whole input is just
+    whitespace separated ints, alternating between the two columns.
+    """
+    with warnings.catch_warnings():
+        # numpy only warns when it can't read to the end (for now)
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(data, dtype=np.int64, sep=" ")
+        except (DeprecationWarning, ValueError):
+            raise Exception("Bad Pattern, not all whitespace separated numbers")
+
+    # the right number of values isn't enough (`3 4 5\n6`), count them per line:
+    # a value starts wherever a non-blank byte follows a blank one (whitespace
+    # and control bytes are all <= 32)
+    text = np.frombuffer(data.encode(), dtype=np.uint8)
+    blank = text <= 32
+    starts = ~blank
+    starts[1:] &= blank[:-1]
+    # every line has at least its own newline byte, so none is empty
+    line_starts = np.concatenate(([0], np.flatnonzero(text == 10) + 1))
+    line_starts = line_starts[line_starts < len(text)]
+    per_line = np.add.reduceat(starts, line_starts, dtype=np.int64) if len(text) else line_starts
+    if (per_line != 2).any():
+        raise Exception("Bad Pattern, expected two numbers on every line")
 
-    # Each line in the input is like: `123   456`
     # Treat it like a matrix having two columns (vectors), v1 and v2
-    v1, v2 = [], []
-    for line in data.splitlines():
-        m = pattern.match(line)
-        if not m:
-            raise Exception("Bad Pattern, ", line)
+    pairs = values.reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+Histogram = Tuple["np.ndarray", "np.ndarray"]  # sorted ids, and how often each one appears
+
+
+def similarity(v1: "np.ndarray", v2: "np.ndarray") -> int:
+    """Sum of k * (times k is in v1) * (times k is in v2), over every k in both"""
+    return score(np.unique(v1, return_counts=True), np.unique(v2, return_counts=True))
+
+
+def score(h1: Histogram, h2: Histogram) -> int:
+    (k1, c1), (k2, c2) = h1, h2
+    if not len(k1) or not len(k2):
+        return 0
+
+    # where each of v1's ids would sit in v2's (sorted) ids, and whether it's really there
+    i = np.minimum(np.searchsorted(k2, k1), len(k2) - 1)
+    found = k2[i] == k1
+
+    # Python ints for the products, the counts can be big enough to overflow int64
+    return int((k1[found].astype(object) * c1[found] * c2[i[found]]).sum())
+
+
+@time_it
+def main(data: str) -> int:
+    v1, v2 = columns(data)
+    return similarity(v1, v2)
+
+
+def histograms(fp: str, start: int, end: int) -> Tuple[Histogram, Histogram]:
+    """Histograms of both columns, for the lines starting within bytes [start, end) of the file"""
+    with open(fp, "rb") as f:
+        if start:
+            # the line running over `start` belongs to the previous chunk
+            f.seek(start - 1)
+            f.readline()
+
+        data = f.read(max(end - f.tell(), 0))
+        if data and not data.endswith(b"\n"):
+            # and the one running over `end` to this one
+            data += f.readline()
+
+    v1, v2 = columns(data.decode())
+    return np.unique(v1, return_counts=True), np.unique(v2, return_counts=True)
+
+
+def merge(parts: List[Histogram]) -> Histogram:
+    keys, inverse = np.unique(np.concatenate([k for k, _ in parts]), return_inverse=True)
+    counts = np.zeros(len(keys), dtype=np.int64)
+    np.add.at(counts, inverse, np.concatenate([c for _, c in parts]))
+    return keys, counts
+
+
+@time_it(files=("fp",))
+def parallel(fp: str, chunk_size: int = 16 * 2**20, workers: Optional[int] = None) -> int:
+    """Same as `main`, straight from a file and spread over a process pool.
 
-        n1, n2 = m.group("n1"), m.group("n2")
-        v1.append(int(n1)), v2.append(int(n2))
+    Every worker histograms both columns of its own `chunk_size` byte range of
+    the file, those get merged, and the score comes from the merged histograms.
+    The input is only read once, by the workers, and memory is bounded by the
+    number of distinct ids, not the number of lines.
+    """
+    size = os.path.getsize(fp)
+    starts = range(0, size, chunk_size)
 
-    # Instantiate a counter for v2
-    # Accumulate the v1*times it appears in v2
-    # take advantage of Counter defaulting to zero
-    c = Counter(v2)
-    distance = 0
-    for k in v1:
-        distance += (k * c[k])
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    h1, h2 = empty, empty
+    with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        # folded in as they come back, so only one merged histogram per column is kept
+        for p1, p2 in pool.map(
+            histograms,
+            [fp] * len(starts),
+            starts,
+            [min(start + chunk_size, size) for start in starts],
+        ):
+            h1, h2 = merge([h1, p1]), merge([h2, p2])
 
-    return distance
+    return score(h1, h2)
 
 
 if __name__ == "__main__":
-    print(main(read_input(input_path(__file__).replace(".txt", "_practice.txt"))))
-    print(main(read_input(input_path(__file__))))
+    if len(sys.argv) > 1:
+        # python part_2.py <huge input> [chunk MiB]
+        print(parallel(sys.argv[1], chunk_size=int(float(sys.argv[2]) * 2**20) if len(sys.argv) > 2 else 16 * 2**20))
+    else:
+        print(main(read_input(input_path(__file__).replace(".txt", "_practice.txt"))))
+        print(main(read_input(input_path(__file__))))
@@ -1,52 +1,26 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from dataclasses import dataclass
 from functools import reduce
-from typing import List, Optional, Set, Dict
+from typing import List, Set, Dict
 
+from grid import Grid
 from utils import time_it, read_input, input_path
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    @property
-    def neighbors(self) -> Set[Coord]:
-        return {
-            self.move(d)
-            for d in directions
-        }
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord) -> Coord:
-        return Coord(x=self.x + direction.x, y=self.y + direction.y)
-
-
-directions = (
-    Coord(0, -1),
-    Coord(1, 0),
-    Coord(0, 1),
-    Coord(-1, 0),
-)
-
-
 class Region:
-    def __init__(self, label: str, plots: Set[Coord]):
+    def __init__(self, grid: Grid, label: int, plots: Set[int]):
+        self.grid = grid
         self.label = label
         self.plots = plots
-        self.neighbors: Set[Coord] = self._calculate_neighbors(self.plots)
+        self.neighbors: Set[int] = self._calculate_neighbors(grid, self.plots)
 
     @staticmethod
-    def _calculate_neighbors(plots: Set[Coord]) -> Set[Coord]:
+    def _calculate_neighbors(grid: Grid, plots: Set[int]) -> Set[int]:
         neighbors = {
-            neighbor
+            plot + d
             for plot in plots
-            for neighbor in plot.neighbors
+            for d in grid.directions
         }
 
         return neighbors - plots
@@ -57,12 +31,12 @@ class Region:
 
     @property
     def perimeter(self):
-        horizontal_directions = (Coord(x=1, y=0), Coord(x=-1, y=0),)
-        vertical_directions = (Coord(x=0, y=1), Coord(x=0, y=-1),)
+        horizontal_directions = (self.grid.right, self.grid.left,)
+        vertical_directions = (self.grid.down, self.grid.up,)
 
         dmap = {
             d: defaultdict(list)
-            for d in directions
+            for d in self.grid.directions
         }
 
         # a single "neighbor" plot can represent 4 perimeters
@@ -77,13 +51,14 @@ class Region:
         #   }, ...
         # }
         for neighbor in self.neighbors:
+            x, y = self.grid.xy(neighbor)
             for d in horizontal_directions:
-                if neighbor.move(d) in self.plots:
-                    dmap[d][neighbor.x].append(neighbor.y)
+                if neighbor + d in self.plots:
+                    dmap[d][x].append(y)
 
             for d in vertical_directions:
-                if neighbor.move(d) in self.plots:
-                    dmap[d][neighbor.y].append(neighbor.x)
+                if neighbor + d in self.plots:
+                    dmap[d][y].append(x)
 
         # for each direction/index combination, sort all the
         # axes that fall along the index. Count the "splits"
@@ -103,14 +78,14 @@ class Region:
 
         return perimeter
 
-    def is_neighbor(self, coord: Coord):
-        return coord in self.neighbors
+    def is_neighbor(self, plot: int):
+        return plot in self.neighbors
 
-    def add(self, coord: Coord) -> Region:
-        if coord not in self.neighbors:
-            raise Exception("Cannot add coord, not a neighbor.")
+    def add(self, plot: int) -> Region:
+        if plot not in self.neighbors:
+            raise Exception("Cannot add plot, not a neighbor.")
 
-        return Region(label=self.label, plots=self.plots | {coord})
+        return Region(self.grid, label=self.label, plots=self.plots | {plot})
 
     def merge(self, other: Region) -> Region:
         if other.label != self.label:
@@ -119,62 +94,43 @@ class Region:
         if not self.plots & other.plots:
             raise Exception("Cannot merge. Regions do not share a common plot.")
 
-        return Region(label=other.label, plots=other.plots | self.plots)
-
-
-class Plane:
-    def __init__(self, data: List[List[str]]):
-        self.data = data
-        self.shape = len(data), len(data[0])
-
-    def _exists(self, c: Coord):
-        return 0 <= c.y < self.shape[0] and 0 <= c.x < self.shape[1]
-
-    def get(self, item: Coord) -> Optional[str]:
-        if self._exists(item):
-            return self.data[item.y][item.x]
-
-    def __iter__(self):
-        # reading order
-        for y in range(self.shape[1]):
-            for x in range(self.shape[0]):
-                c = Coord(x, y)
-                yield c, self.get(c)
+        return Region(self.grid, label=other.label, plots=other.plots | self.plots)
 
 
 @time_it
 def main(data: str) -> int:
-    plane = Plane([list(p) for p in data.splitlines()])
+    grid = Grid.parse(data)
 
     # split the plane into "regions" by label
-    regions: Dict[str, List[Region]] = {}
-    for coord, plant in plane:
+    regions: Dict[int, List[Region]] = {}
+    for plot in grid:
+        plant = grid[plot]
 
         # create a new "region" of 1 plot
         if plant not in regions:
-            regions[plant] = [Region(label=plant, plots={coord})]
+            regions[plant] = [Region(grid, label=plant, plots={plot})]
             continue
 
         # figure out if the plot can "merge" into an existing region
         neighboring_regions = []
         others = []
         for region in regions[plant]:
-            if region.is_neighbor(coord):
+            if region.is_neighbor(plot):
                 neighboring_regions.append(region)
             else:
                 others.append(region)
 
         # can't merge, create a new one
         if not neighboring_regions:
-            regions[plant].append(Region(label=plant, plots={coord}))
+            regions[plant].append(Region(grid, label=plant, plots={plot}))
             continue
 
         # for all regions the plot is touching, add the plot to the
         # region and merge all the regions
         merged_regions = reduce(
-            lambda l, r: l.merge(r.add(coord)),
+            lambda l, r: l.merge(r.add(plot)),
             neighboring_regions,
-            Region(label=plant, plots={coord})
+            Region(grid, label=plant, plots={plot})
         )
 
         regions[plant] = others + [merged_regions]
@@ -7,27 +7,13 @@ import math
 import re
 from typing import Callable, Dict
 
+from coord import Coord
 from utils import time_it, read_input, input_path
 
 
 PTRN = re.compile(r'p=(.*),(.*)\sv=(.*),(.*)')
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord, n: int) -> Coord:
-        return Coord(
-            x=self.x + direction.x*n,
-            y=self.y + direction.y*n
-        )
-
-
 @dataclass
 class Robot:
     position: Coord
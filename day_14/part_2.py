@@ -3,47 +3,18 @@ from __future__ import annotations
 from dataclasses import dataclass
 from functools import partial
 from itertools import cycle
-import pickle
 import re
 from typing import Callable, Dict, List
 
-import numpy as np
-
+from coord import Coord
+from lazy import lazy_import
 from utils import time_it, read_input, input_path
 
-
-PTRN = re.compile(r'p=(.*),(.*)\sv=(.*),(.*)')
+np = lazy_import("numpy")
+pickle = lazy_import("pickle")
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord, n: int) -> Coord:
-        return Coord(
-            x=self.x + direction.x*n,
-            y=self.y + direction.y*n
-        )
-
-    @property
-    def neighbors(self) -> List[Coord]:
-        return [
-            self.move(d, 1)
-            for d in [
-                Coord(-1, -1),
-                Coord(0, -1),
-                Coord(1, -1),
-                Coord(-1, 0),
-                Coord(1, 0),
-                Coord(-1, 1),
-                Coord(0, 1),
-                Coord(1, 1),
-            ]
-        ]
+PTRN = re.compile(r'p=(.*),(.*)\sv=(.*),(.*)')
 
 
 @dataclass
@@ -1,78 +1,22 @@
 from __future__ import annotations
 
 import bisect
-from copy import deepcopy
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Set
+from typing import Dict, Set
 
+import counters
+from grid import Grid, OUTSIDE
 from utils import time_it, read_input, input_path
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord) -> Coord:
-        return Coord(x=self.x + direction.x, y=self.y + direction.y)
-
-    @property
-    def pivot(self) -> Coord:
-        # always around 0,0
-        return Coord(x=-self.y, y=self.x)
-
-    @property
-    def pivot_right(self) -> Coord: return self.pivot
-
-    @property
-    def pivot_left(self) -> Coord: return self.pivot_right.inverse
-
-    @property
-    def inverse(self) -> Coord:
-        return Coord(x=-self.x, y=-self.y)
-
-
-class HitBoundaryException(Exception):
-    pass
-
-
-class Plane:
-    def __init__(self, data: List[List[str]]):
-        self.data = data
-        self.shape = len(data), len(data[0])
-
-    def _exists(self, c: Coord):
-        return 0 <= c.y < self.shape[0] and 0 <= c.x < self.shape[1]
-
-    def get(self, item: Coord, default = None) -> Optional[str]:
-        if self._exists(item):
-            return self.data[item.y][item.x]
-        return default
-
-    def __getitem__(self, item: Coord) -> str:
-        assert self._exists(item)
-        return self.data[item.y][item.x]
-
-    def __iter__(self):
-        # reading order
-        for y in range(self.shape[1]):
-            for x in range(self.shape[0]):
-                c = Coord(x, y)
-                yield c, self.get(c)
-
-    def print(self):
-        for line in self.data:
-            print("".join(line))
+WALL, END = ord("#"), ord("E")
 
 
 @dataclass
 class Reindeer:
-    position: Coord
-    direction: Coord
-    path: Set[Coord]
+    position: int
+    direction: int
+    path: Set[int]
     score: int
 
     def __eq__(self, other: Reindeer):
@@ -80,9 +24,9 @@ class Reindeer:
 
 
 def race(
-    _map: Plane,
-    start_position: Coord,
-    start_direction: Coord,
+    _map: Grid,
+    start_position: int,
+    start_direction: int,
 ) -> Reindeer:
 
     all_reindeer = [
@@ -95,7 +39,8 @@ def race(
     ]
 
     # Keep track by position/direction
-    visited: Dict[(Coord, Coord), int] = {}
+    visited: Dict[(int, int), int] = {}
+    stats = counters.active
 
     while True:
         # always pull from the front, assuming ordered
@@ -103,8 +48,13 @@ def race(
 
         # pruning
         if reindeer.score > visited.get((reindeer.position, reindeer.direction), reindeer.score):
+            if stats is not None:
+                stats["pruned"] += 1
             continue
         visited[(reindeer.position, reindeer.direction)] = reindeer.score
+        if stats is not None:
+            stats["expanded"] += 1
+            stats.peak("frontier_peak", len(all_reindeer) + 1)
 
         # Pruning attempt
         # If reindeer are found at the same position with the same score,
@@ -117,25 +67,27 @@ def race(
             else:
                 other = all_reindeer.pop(i)
                 reindeer.path |= other.path
+                if stats is not None:
+                    stats["merged"] += 1
 
         # This reindeer should have all the converged paths
-        if _map[reindeer.position] == "E":
+        if _map[reindeer.position] == END:
             return reindeer
 
         for d, s in [
             (reindeer.direction, 1,),
-            (reindeer.direction.pivot_right, 1001,),
-            (reindeer.direction.pivot_left, 1001,),
+            (_map.right_of[reindeer.direction], 1001,),
+            (_map.left_of[reindeer.direction], 1001,),
         ]:
-            coord = reindeer.position.move(d)
-            if _map.get(coord, default="#") != "#" and coord not in reindeer.path:
+            position = reindeer.position + d
+            if _map[position] not in (WALL, OUTSIDE) and position not in reindeer.path:
                 # insert based on the score to support priority processing
                 bisect.insort_left(
                     all_reindeer,
                     Reindeer(
-                        position=coord,
+                        position=position,
                         direction=d,
-                        path=reindeer.path | {coord},
+                        path=reindeer.path | {position},
                         score=reindeer.score + s
                     ),
                     key=lambda r: r.score
@@ -144,11 +96,11 @@ def race(
 
 @time_it
 def main(data: str) -> int:
-    plane = Plane([list(row) for row in data.splitlines()])
-    start_position = next(c for c, v in plane if v == "S")
-    start_direction = Coord(x=1, y=0)
+    grid = Grid.parse(data)
+    start_position = grid.find("S")
+    start_direction = grid.right
 
-    reindeer = race(plane, start_position=start_position, start_direction=start_direction)
+    reindeer = race(grid, start_position=start_position, start_direction=start_direction)
     return len(set(reindeer.path))
 
 
@@ -1,83 +1,45 @@
 from __future__ import annotations
 
-import bisect
 from dataclasses import dataclass
 from typing import List, Optional, Set
 
+from coord import Coord
+import counters
+from grid import Grid
 from utils import time_it, read_input, input_path
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord) -> Coord:
-        return Coord(x=self.x + direction.x, y=self.y + direction.y)
-
-    @property
-    def pivot(self) -> Coord:
-        # always around 0,0
-        return Coord(x=-self.y, y=self.x)
-
-    @property
-    def pivot_right(self) -> Coord: return self.pivot
-
-    @property
-    def pivot_left(self) -> Coord: return self.pivot_right.inverse
-
-    @property
-    def inverse(self) -> Coord:
-        return Coord(x=-self.x, y=-self.y)
-
-    def distance(self, other: Coord):
-        return abs(self.x - other.x) + abs(self.y - other.y)
-
-
-class Plane:
-    def __init__(self, shape: Coord):
-        self.shape = shape
-
-    def exists(self, c: Coord):
-        return 0 <= c.y < self.shape.y and 0 <= c.x < self.shape.x
-
-    def print(self, masks: List[(List[Coord], str)] = None):
-        masks = masks or []
-        mask = {}
-        for path, value in masks:
-            for coord in path:
-                mask[coord] = value
-
-        for y in range(self.shape.y):
-            print("".join([
-                mask.get(Coord(x, y), ".")
-                for x in range(self.shape.x)
-            ]))
+SPACE = ord(".")
 
 
 @dataclass
 class Path:
-    position: Coord
-    direction: Coord
-    path: Set[Coord]
+    position: int
+    direction: int
+    path: Set[int]
     steps: int = 0
 
 
-def search(falling_bytes: List[Coord], start: Coord, stop: Coord, shape: Coord) -> Path:
-    plane = Plane(shape=shape)
-    falling_bytes = set(falling_bytes)
+def memory_space(falling_bytes: List[Coord], shape: Coord) -> Grid:
+    grid = Grid.blank(shape.x, shape.y)
+    for c in falling_bytes:
+        grid[grid.index(c.x, c.y)] = "#"
+    return grid
+
 
+def search(grid: Grid, start: int, stop: int) -> Optional[Path]:
     paths = [
-        Path(position=start, direction=Coord(1, 0), path={start})
+        Path(position=start, direction=grid.right, path={start})
     ]
 
     visited = {start}
+    stats = counters.active
 
     while True:
         next_paths = []
+        if stats is not None:
+            stats["expanded"] += len(paths)
+            stats.peak("frontier_peak", len(paths))
 
         for path in paths:
             if path.position == stop:
@@ -85,15 +47,15 @@ def search(falling_bytes: List[Coord], start: Coord, stop: Coord, shape: Coord)
 
             for d in (
                 path.direction,
-                path.direction.pivot_left,
-                path.direction.pivot_right
+                grid.left_of[path.direction],
+                grid.right_of[path.direction]
             ):
-                position = path.position.move(d)
+                position = path.position + d
+                # open memory only, not off the map or a fallen byte
                 if (
-                    plane.exists(position)
+                    grid[position] == SPACE
                     and position not in visited
                     and position not in path.path
-                    and (path.path | {position}).isdisjoint(falling_bytes)
                 ):
                     visited.add(position)
                     next_paths.append(
@@ -116,22 +78,17 @@ def main(data: str, stop: Coord, n_bytes: int) -> int:
         x, y = line.split(",")
         falling_bytes.append(Coord(int(x), int(y)))
 
+    grid = memory_space(falling_bytes[:n_bytes], shape=Coord(stop.x + 1, stop.y + 1))
+
     best_path = search(
-        falling_bytes=falling_bytes[:n_bytes],
-        start=Coord(0, 0),
-        stop=stop,
-        shape=Coord(stop.x+1, stop.y+1)
+        grid,
+        start=grid.index(0, 0),
+        stop=grid.index(stop.x, stop.y),
     )
 
-    (
-        Plane(Coord(stop.x + 1, stop.y + 1))
-        .print(
-            masks=[
-                (best_path.path, "O",),
-                (falling_bytes[:n_bytes], "#",)
-            ]
-        )
-    )
+    for i in best_path.path:
+        grid[i] = "O"
+    grid.print()
 
     return best_path.steps
 
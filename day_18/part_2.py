@@ -1,83 +1,45 @@
 from __future__ import annotations
 
-import bisect
 from dataclasses import dataclass
 from typing import List, Optional, Set
 
+from coord import Coord
+import counters
+from grid import Grid
 from utils import time_it, read_input, input_path
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord) -> Coord:
-        return Coord(x=self.x + direction.x, y=self.y + direction.y)
-
-    @property
-    def pivot(self) -> Coord:
-        # always around 0,0
-        return Coord(x=-self.y, y=self.x)
-
-    @property
-    def pivot_right(self) -> Coord: return self.pivot
-
-    @property
-    def pivot_left(self) -> Coord: return self.pivot_right.inverse
-
-    @property
-    def inverse(self) -> Coord:
-        return Coord(x=-self.x, y=-self.y)
-
-    def distance(self, other: Coord):
-        return abs(self.x - other.x) + abs(self.y - other.y)
-
-
-class Plane:
-    def __init__(self, shape: Coord):
-        self.shape = shape
-
-    def exists(self, c: Coord):
-        return 0 <= c.y < self.shape.y and 0 <= c.x < self.shape.x
-
-    def print(self, masks: List[(List[Coord], str)] = None):
-        masks = masks or []
-        mask = {}
-        for path, value in masks:
-            for coord in path:
-                mask[coord] = value
-
-        for y in range(self.shape.y):
-            print("".join([
-                mask.get(Coord(x, y), ".")
-                for x in range(self.shape.x)
-            ]))
+SPACE = ord(".")
 
 
 @dataclass
 class Path:
-    position: Coord
-    direction: Coord
-    path: Set[Coord]
+    position: int
+    direction: int
+    path: Set[int]
     steps: int = 0
 
 
-def search(falling_bytes: List[Coord], start: Coord, stop: Coord, shape: Coord) -> Path:
-    plane = Plane(shape=shape)
-    falling_bytes = set(falling_bytes)
+def memory_space(falling_bytes: List[Coord], shape: Coord) -> Grid:
+    grid = Grid.blank(shape.x, shape.y)
+    for c in falling_bytes:
+        grid[grid.index(c.x, c.y)] = "#"
+    return grid
+
 
+def search(grid: Grid, start: int, stop: int) -> Optional[Path]:
     paths = [
-        Path(position=start, direction=Coord(1, 0), path={start})
+        Path(position=start, direction=grid.right, path={start})
     ]
 
     visited = {start}
+    stats = counters.active
 
     while paths:
         next_paths = []
+        if stats is not None:
+            stats["expanded"] += len(paths)
+            stats.peak("frontier_peak", len(paths))
 
         for path in paths:
             if path.position == stop:
@@ -85,15 +47,15 @@ def search(falling_bytes: List[Coord], start: Coord, stop: Coord, shape: Coord)
 
             for d in (
                 path.direction,
-                path.direction.pivot_left,
-                path.direction.pivot_right
+                grid.left_of[path.direction],
+                grid.right_of[path.direction]
             ):
-                position = path.position.move(d)
+                position = path.position + d
+                # open memory only, not off the map or a fallen byte
                 if (
-                    plane.exists(position)
+                    grid[position] == SPACE
                     and position not in visited
                     and position not in path.path
-                    and (path.path | {position}).isdisjoint(falling_bytes)
                 ):
                     visited.add(position)
                     next_paths.append(
@@ -116,16 +78,14 @@ def main(data: str, stop: Coord, n_bytes: int) -> Coord:
         x, y = line.split(",")
         falling_bytes.append(Coord(int(x), int(y)))
 
-    i = 0
-    while True:
-        i += 1
-        if search(
-            falling_bytes=falling_bytes[:n_bytes+i],
-            start=Coord(0, 0),
-            stop=stop,
-            shape=Coord(stop.x + 1, stop.y + 1)
-        ) is None:
-            return falling_bytes[n_bytes+i-1]
+    grid = memory_space(falling_bytes[:n_bytes], shape=Coord(stop.x + 1, stop.y + 1))
+    start, end = grid.index(0, 0), grid.index(stop.x, stop.y)
+
+    # drop the bytes one at a time, until there's no way out
+    for c in falling_bytes[n_bytes:]:
+        grid[grid.index(c.x, c.y)] = "#"
+        if search(grid, start=start, stop=end) is None:
+            return c
 
 
 if __name__ == "__main__":
@@ -1,7 +1,10 @@
-from typing import Callable, List
+from typing import Callable, List, Tuple
 
+from lazy import lazy_import
 from utils import time_it, read_input, input_path
 
+np = lazy_import("numpy")
+
 
 def ascending(a: int, b: int) -> bool: return b > a
 def descending(a: int, b: int) -> bool: return a > b
@@ -19,12 +22,56 @@ def check(level: List[int]) -> bool:
     return True
 
 
+# Reports longer than this are checked one at a time, so a single long one
+# doesn't blow up the padded array for everything else.
+LONGEST_PADDED = 64
+
+
+def reports(lines: List[str], lengths: List[int]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """All reports as one (reports, longest report) array, padded with zeros,
+    and the length of each report."""
+    lengths = np.array(lengths, dtype=np.int64)
+    levels = np.zeros((len(lines), lengths.max(initial=0)), dtype=np.int64)
+
+    # filled row by row, in the same order the levels are read
+    levels[np.arange(levels.shape[1]) < lengths[:, None]] = np.fromstring(" ".join(lines), dtype=np.int64, sep=" ")
+    return levels, lengths
+
+
+def steps_ok(steps: "np.ndarray", sign: int) -> "np.ndarray":
+    """Whether each step goes the right way, by 1-3"""
+    steps = steps * sign
+    return (steps >= 1) & (steps <= 3)
+
+
+def check_all(levels: "np.ndarray", lengths: "np.ndarray") -> "np.ndarray":
+    """`check` for every (padded) report at once"""
+    steps = np.diff(levels, axis=1)
+    # steps past the end of a report are fine either way
+    padding = np.arange(steps.shape[1]) >= (lengths - 1)[:, None]
+
+    return (
+        (steps_ok(steps, 1) | padding).all(axis=1)
+        | (steps_ok(steps, -1) | padding).all(axis=1)
+    )
+
+
 @time_it
 def main(data: str) -> int:
+    lines = data.splitlines()
+    lengths = [line.count(" ") + 1 for line in lines]
+
     safe = 0
-    for line in data.splitlines():
-        level = [int(v) for v in line.split(" ")]
-        safe += check(level)
+    if max(lengths, default=0) > LONGEST_PADDED:
+        for line, n in zip(lines, lengths):
+            if n > LONGEST_PADDED:
+                safe += check([int(v) for v in line.split(" ")])
+
+        short = [(line, n) for line, n in zip(lines, lengths) if n <= LONGEST_PADDED]
+        lines, lengths = [line for line, _ in short], [n for _, n in short]
+
+    if lines:
+        safe += int(check_all(*reports(lines, lengths)).sum())
 
     return safe
 
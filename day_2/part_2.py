@@ -1,65 +1,139 @@
-from collections import Counter
-from typing import List
+from collections import deque
+from typing import Iterable, List, Tuple
 
+from lazy import lazy_import
 from utils import time_it, read_input, input_path
 
+np = lazy_import("numpy")
 
-def differ(l: int, r: int) -> bool: return 1 <= abs(l - r) <= 3
 
+def check(record: Iterable[int], tolerance: int = 1) -> bool:
+    """Checks whether a record is 'safe' (true) or 'unsafe' (false), once up to
+    `tolerance` "bad levels" have been removed from it.
 
-def check(record: List[int], tolerance: bool = True) -> bool:
-    """Checks whether a record is 'safe' (true) or 'unsafe' (false).
-    Ability to apply a single level of "tolerance" to the record, effectively
-    removing a "bad level", attempting to determine success after it is removed.
+    One pass, no copies: for each direction, track the fewest removals that give
+    a safe run ending on each level. A run ending on a level either starts there
+    (every level before it removed), or extends a run ending on one of the
+    `tolerance + 1` levels before it (the ones in between removed), if the step
+    between the two goes the right way by 1-3. So only those last few levels
+    need remembering, O(n * tolerance) time and O(tolerance) memory.
 
-    Iterate through the record, checking adjacent levels.
-    If the "distance" between all levels pass and if all directionality is the same,
-    then the record is good.
+    The record is safe if a run ends within the last `tolerance + 1` levels, with
+    few enough removals left to drop the levels after it.
+    """
+    # per direction, (index, level, fewest removals for a run ending on it)
+    windows = {
+        sign: deque(maxlen=tolerance + 1)
+        for sign in (1, -1)
+    }
+
+    n = 0
+    for i, level in enumerate(record):
+        alive = False
+        for sign, window in windows.items():
+            removals = i
+            for j, previous, r in window:
+                if 1 <= (level - previous) * sign <= 3 and r + i - j - 1 < removals:
+                    removals = r + i - j - 1
+
+            window.append((i, level, removals))
+            alive = alive or any(r <= tolerance for _, _, r in window)
+        n = i + 1
+
+        # no run left to extend, and starting over would remove too much
+        if not alive:
+            return False
+
+    return any(
+        r + (n - 1 - j) <= tolerance
+        for window in windows.values()
+        for j, _, r in window
+    )
 
-    Otherwise, check if the directionality or distance is the issue.
 
-    1. Determine the "popular direction" of the vector. Find the first "unpopular"
-    direction, and attempt to swap both of the tagged levels.
-    2. Find the first incorrect distance, and attempt to swap both of the tagged levels.
-    """
-    directions = []
-    distances = []
+# Reports longer than this are checked one at a time, so a single long one
+# doesn't blow up the padded array for everything else.
+LONGEST_PADDED = 64
 
-    for i in range(len(record) - 1):
-        l, r = record[i], record[i + 1]
-        directions.append(l < r)
-        distances.append(differ(l, r))
 
-    valid_directions = len(set(directions)) == 1
-    valid_distances = all(distances)
+def reports(lines: List[str], lengths: List[int]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """All reports as one (reports, longest report) array, padded with zeros,
+    and the length of each report."""
+    lengths = np.array(lengths, dtype=np.int64)
+    levels = np.zeros((len(lines), lengths.max(initial=0)), dtype=np.int64)
 
-    if valid_directions and valid_distances:
-        return True
+    # filled row by row, in the same order the levels are read
+    levels[np.arange(levels.shape[1]) < lengths[:, None]] = np.fromstring(" ".join(lines), dtype=np.int64, sep=" ")
+    return levels, lengths
 
-    if not tolerance:
-        return False
 
-    if not valid_directions:
-        c = Counter(directions)
-        least_popular = not c.most_common(1)[0][0]
-        i = directions.index(least_popular)
+def steps_ok(steps: "np.ndarray", sign: int) -> "np.ndarray":
+    """Whether each step goes the right way, by 1-3"""
+    steps = steps * sign
+    return (steps >= 1) & (steps <= 3)
 
-    # distances must be invalid
-    else:
-        i = distances.index(False)
 
-    return (
-        check(record[:i] + record[i + 1:], False)
-        or check(record[:i + 1] + record[i + 2:], False)
-    )
+def check_all(levels: "np.ndarray", lengths: "np.ndarray") -> "np.ndarray":
+    """`check` (with one removal) for every (padded) report at once.
+
+    Every "remove level i" variant of every report is checked together: with
+    level i gone, the steps before i - 1 and after i + 1 must still be fine, and
+    so must the new step bridging i - 1 to i + 1. Prefix/suffix `all`s of the
+    step checks cover the first two for every i, so it's O(levels) per report.
+    """
+    n, width = levels.shape
+    if width < 3:
+        # anything with at most 2 levels is safe once one's removed
+        return np.ones(n, dtype=bool)
+
+    i = np.arange(width)
+    steps = np.diff(levels, axis=1)
+    bridges = levels[:, 2:] - levels[:, :-2]
+    # steps/bridges past the end of a report are fine either way
+    padding = i[:-1] >= (lengths - 1)[:, None]
+    no_bridge = i[1:-1] >= (lengths - 1)[:, None]
+
+    safe = np.zeros(n, dtype=bool)
+    for sign in (1, -1):
+        ok = steps_ok(steps, sign) | padding
+
+        # before[:, i]: every step up to level i is fine, after[:, i]: every step from level i on
+        before = np.ones((n, width), dtype=bool)
+        before[:, 1:] = np.logical_and.accumulate(ok, axis=1)
+        after = np.ones((n, width + 1), dtype=bool)
+        after[:, :-2] = np.logical_and.accumulate(ok[:, ::-1], axis=1)[:, ::-1]
+
+        bridged = np.ones((n, width), dtype=bool)
+        bridged[:, 1:-1] = steps_ok(bridges, sign) | no_bridge
+
+        removed = (
+            before[:, np.maximum(i - 1, 0)]
+            & after[:, i + 1]
+            & bridged
+            & (i < lengths[:, None])
+        )
+        # nothing removed at all, or any one level removed
+        safe |= after[:, 0] | removed.any(axis=1)
+
+    return safe
 
 
 @time_it
 def main(data: str) -> int:
+    lines = data.splitlines()
+    lengths = [line.count(" ") + 1 for line in lines]
+
     safe = 0
-    for line in data.splitlines():
-        level = [int(v) for v in line.split(" ")]
-        safe += check(level)
+    if max(lengths, default=0) > LONGEST_PADDED:
+        for line, n in zip(lines, lengths):
+            if n > LONGEST_PADDED:
+                safe += check([int(v) for v in line.split(" ")])
+
+        short = [(line, n) for line, n in zip(lines, lengths) if n <= LONGEST_PADDED]
+        lines, lengths = [line for line, _ in short], [n for _, n in short]
+
+    if lines:
+        safe += int(check_all(*reports(lines, lengths)).sum())
 
     return safe
 
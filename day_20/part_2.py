@@ -1,94 +1,19 @@
 from __future__ import annotations
 
-from collections import Counter
 from dataclasses import dataclass
-from typing import List, Optional, Generator, Dict
+from typing import Generator, Dict, List, Tuple
 
+from grid import Grid
 from utils import time_it, read_input, input_path
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord, n: int = 1) -> Coord:
-        return Coord(x=self.x + (direction.x*n), y=self.y + (direction.y*n))
-
-    @property
-    def pivot(self) -> Coord:
-        # always around 0,0
-        return Coord(x=-self.y, y=self.x)
-
-    @property
-    def pivot_right(self) -> Coord: return self.pivot
-
-    @property
-    def pivot_left(self) -> Coord: return self.pivot_right.inverse
-
-    @property
-    def inverse(self) -> Coord:
-        return Coord(x=-self.x, y=-self.y)
-
-    def distance(self, other: Coord):
-        return abs(self.x - other.x) + abs(self.y - other.y)
-
-    def neighbors(self, n: int = 1) -> Generator[Coord, None, None]:
-        for d in directions:
-            yield self.move(d, n=n)
-
-    def expand(self, n: int = 1) -> Generator[(int, Coord), None, None]:
-        for i in range(1, n+1):
-            x, y = i, 0
-            for _ in range(i+1):
-                yield from {
-                    (i, Coord(x=self.x + x, y = self.y + y)),
-                    (i, Coord(x=self.x + x, y = self.y - y)),
-                    (i, Coord(x=self.x - x, y = self.y - y)),
-                    (i, Coord(x=self.x - x, y = self.y + y)),
-                }
-                x -= 1
-                y += 1
-
-
-directions = (
-    Coord(0, 1),
-    Coord(1, 0),
-    Coord(0, -1),
-    Coord(-1, 0),
-)
-
-class Plane:
-    def __init__(self, data: List[List[str]]):
-        self.data = data
-        self.shape = Coord(len(data[0]), len(data))
-
-    def exists(self, c: Coord):
-        return 0 <= c.y < self.shape.y and 0 <= c.x < self.shape.x
-
-    def get(self, item: Coord, default = None) -> Optional[str]:
-        if self.exists(item):
-            return self.data[item.y][item.x]
-        return default
-
-    def __getitem__(self, item: Coord) -> str:
-        assert self.exists(item)
-        return self.data[item.y][item.x]
-
-    def __iter__(self) -> Generator[(Coord, Optional[str]), None, None]:
-        # reading order
-        for y in range(self.shape.y):
-            for x in range(self.shape.x):
-                c = Coord(x, y)
-                yield c, self.get(c)
-
-
-def get_racetrack(plane: Plane) -> Dict[Coord, int]:
-    start: Coord = next(c for c, v in plane if v == "S")
-    end: Coord = next(c for c, v in plane if v == "E")
+TRACK = ord(".")
+CHEAT = 20
+
+
+def get_racetrack(grid: Grid) -> Dict[int, int]:
+    start = grid.find("S")
+    end = grid.find("E")
 
     path = {}
     prev = None
@@ -96,12 +21,13 @@ def get_racetrack(plane: Plane) -> Dict[Coord, int]:
     i = 0
     while current != end:
         path[current] = i
-        for neighbor in current.neighbors():
+        for d in grid.directions:
+            neighbor = current + d
             if neighbor == end:
                 path[neighbor] = i+1
                 return path
 
-            if plane.get(neighbor) == "." and neighbor != prev:
+            if grid[neighbor] == TRACK and neighbor != prev:
                 i += 1
                 prev = current
                 current = neighbor
@@ -112,31 +38,47 @@ def get_racetrack(plane: Plane) -> Dict[Coord, int]:
 
 @dataclass
 class Cheat:
-    start: Coord
-    end: Coord
+    start: int
+    end: int
     picoseconds: int
 
 
-def get_cheats(racetrack: Dict[Coord, int], plane: Plane) -> Generator[Cheat, None, None]:
+def expand(grid: Grid, n: int = 1) -> List[Tuple[int, int]]:
+    """(steps, offset) for every cell within n steps (manhattan distance)"""
+    offsets = []
+    for i in range(1, n+1):
+        x, y = i, 0
+        ring = set()
+        for _ in range(i+1):
+            ring |= {
+                y * grid.stride + x,
+                -y * grid.stride + x,
+                -y * grid.stride - x,
+                y * grid.stride - x,
+            }
+            x -= 1
+            y += 1
+        offsets.extend((i, offset) for offset in ring)
+    return offsets
+
+
+def get_cheats(racetrack: Dict[int, int], grid: Grid) -> Generator[Cheat, None, None]:
+    offsets = expand(grid, n=CHEAT)
     for start, start_position in racetrack.items():
-        candidates = (
-            (step, end)
-            for (step, end) in start.expand(n=20)
-            if plane.exists(end)
-        )
-        for step, end in candidates:
-            end_position = racetrack.get(end, -1)
+        for step, offset in offsets:
+            end_position = racetrack.get(start + offset, -1)
             time_saved = end_position - start_position - step
 
             if time_saved:
-                yield Cheat(start, end, time_saved)
+                yield Cheat(start, start + offset, time_saved)
 
 
 @time_it
 def main(data: str) -> int:
-    plane = Plane([list(line) for line in data.splitlines()])
-    racetrack = get_racetrack(plane)
-    cheats = get_cheats(racetrack, plane)
+    # padded so a cheat off the edge lands on the padding, not on another row
+    grid = Grid.parse(data, pad=CHEAT)
+    racetrack = get_racetrack(grid)
+    cheats = get_cheats(racetrack, grid)
     best_cheats = (c for c in cheats if c.picoseconds >= 100)
     return len(list(best_cheats))
 
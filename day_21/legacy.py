@@ -1,41 +1,26 @@
 from __future__ import annotations
 
 import abc
-from dataclasses import dataclass
 from functools import lru_cache
 from itertools import pairwise, product
 from typing import List, Dict, Optional, Tuple
 
+from coord import Coord, UP, RIGHT, DOWN, LEFT
 from utils import time_it, read_input, input_path
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord, n: int = 1) -> Coord:
-        return Coord(x=self.x + (direction.x*n), y=self.y + (direction.y*n))
-
-    def distance(self, other: Coord) -> int:
-        return abs(self.x - other.x) + abs(self.y - other.y)
-
-
 DIRECTION_TO_LABEL = {
-    Coord(-1, 0): "<",
-    Coord(0, -1): "^",
-    Coord(1, 0):  ">",
-    Coord(0, 1): "v",
+    LEFT: "<",
+    UP: "^",
+    RIGHT: ">",
+    DOWN: "v",
 }
 
 LABEL_TO_DIRECTION = {
-    "<": Coord(-1, 0),
-    "^": Coord(0, -1),
-    ">": Coord(1, 0),
-    "v": Coord(0, 1),
+    "<": LEFT,
+    "^": UP,
+    ">": RIGHT,
+    "v": DOWN,
 }
 
 DIRECTION_WEIGHTS = {
@@ -242,10 +227,10 @@ class Robot(Operator):
             return
 
         match command:
-            case "^": d = Coord(0, -1)
-            case ">": d = Coord(1, 0)
-            case "v": d = Coord(0, 1)
-            case "<": d = Coord(-1, 0)
+            case "^": d = UP
+            case ">": d = RIGHT
+            case "v": d = DOWN
+            case "<": d = LEFT
             case _: raise Exception("Unexpected direction")
 
         self.position = self.position.move(d)
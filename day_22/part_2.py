@@ -1,48 +1,73 @@
-from collections import defaultdict
-from typing import Generator, Tuple
+from functools import lru_cache
+from typing import Generator, List, Tuple
 
 from utils import time_it, read_input, input_path
 
 
-PriceWindow = Tuple[int, int, int, int]
+# four price changes in a row (each -9 to 9), packed base 19 into one int
+PriceWindow = int
+WINDOWS = 19 ** 4
 
 
-def get_secret_numbers(secret_number: int, n: int) -> Generator[int, None, None]:
+def step(secret_number: int) -> int:
     process = (
         lambda v: v * 64,
         lambda v: v // 32,
         lambda v: v * 2048,
     )
 
+    for fn in process:
+        out = fn(secret_number)
+        secret_number = (secret_number ^ out) % 16777216
+
+    return secret_number
+
+
+@lru_cache
+def step_tables() -> Tuple[List[int], List[int]]:
+    """`step` for every value of the low and of the high 12 bits of a secret number.
+
+    A step only XORs, shifts and prunes to 24 bits, so it's linear over the bits:
+    `step(n) == low[n & 4095] ^ high[n >> 12]`. Built once, shared by every buyer
+    and every input.
+    """
+    low = [step(v) for v in range(4096)]
+    high = [step(v << 12) for v in range(4096)]
+    return low, high
+
+
+def get_secret_numbers(secret_number: int, n: int) -> Generator[int, None, None]:
+    low, high = step_tables()
+
     yield secret_number
 
+    # only the low 24 bits survive the first prune
+    secret_number %= 16777216
     for _ in range(n):
-        for fn in process:
-            out = fn(secret_number)
-            secret_number = (secret_number ^ out) % 16777216
-
+        secret_number = low[secret_number & 4095] ^ high[secret_number >> 12]
         yield secret_number
 
 
 def rolling(prices: Generator[int, None, None]) -> Generator[Tuple[PriceWindow, int], None, None]:
-    prices = list(prices)
-    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
+    """Every first occurrence of four price changes in a row, with the price it ends on"""
+    seen = bytearray(WINDOWS)
 
-    seen = set()
-    for i in range(4, len(prices)):
-        _id = tuple(deltas[i-4:i])
-        price = prices[i]
-        if _id not in seen:
-            seen.add(_id)
-            yield _id, price
+    key = 0
+    previous = next(prices)
+    for i, price in enumerate(prices, start=1):
+        key = (key * 19 + price - previous + 9) % WINDOWS
+        previous = price
+        if i >= 4 and not seen[key]:
+            seen[key] = 1
+            yield key, price
 
 
-@time_it
+@time_it(prepare=lambda data: step_tables())
 def main(data: str) -> int:
 
     buyers = (int(line) for line in data.splitlines())
 
-    delta_count = defaultdict(int)
+    delta_count = [0] * WINDOWS
 
     for i, sn in enumerate(buyers):
         secret_numbers = get_secret_numbers(sn, n=2000)
@@ -51,7 +76,7 @@ def main(data: str) -> int:
         for _id, price in rolling(prices):
             delta_count[_id] += price
 
-    return max(delta_count.values())
+    return max(delta_count)
 
 
 if __name__ == "__main__":
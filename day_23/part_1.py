@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Set
 
+import counters
 from utils import time_it, read_input, input_path
 
 
@@ -52,13 +53,21 @@ def main(data: str) -> int:
         graph[left].connect(graph[right])
 
     result = set()
+    stats = counters.active
 
     for node in graph.values():
         for neighbor in node.neighbors:
-            for sc in node.shared_connections(neighbor):
+            shared = node.shared_connections(neighbor)
+            if stats is not None:
+                stats["expanded"] += 1
+                stats["candidates"] += len(shared)
+
+            for sc in shared:
                 out = tuple(sorted([node, neighbor, sc]))
                 if any(n.startswith("t") for n in out):
                     result.add(out)
+                elif stats is not None:
+                    stats["pruned"] += 1
 
     return len(result)
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections import Counter
 from typing import Set
 
+import counters
 from utils import time_it, read_input, input_path
 
 
@@ -53,6 +54,7 @@ def main(data: str) -> str:
         graph[left].connect(graph[right])
 
     networks = set()
+    stats = counters.active
     for node in graph.values():
         connection_count = Counter(node.neighbors)
 
@@ -61,8 +63,14 @@ def main(data: str) -> str:
 
         max_count = max(connection_count.values())
         max_nodes = [n for n, c in connection_count.items() if c == max_count]
+        if stats is not None:
+            stats["expanded"] += 1
+            stats["candidates"] += len(connection_count)
+
         if len(max_nodes) == max_count:
             networks.add(tuple(sorted([node] + max_nodes)))
+        elif stats is not None:
+            stats["pruned"] += 1
 
     networks = sorted(list(networks), key=lambda n: -len(n))
     return ",".join([n.id for n in networks[0]])
@@ -1,10 +1,145 @@
+import os
 import re
+import sys
+from typing import Generator, Iterable, List, Optional, TextIO, Tuple
 
-from utils import time_it, read_input, input_path
+from lazy import lazy_import
+from utils import Benchmark, measure, time_it, read_input, input_path
+
+# only for `parallel`
+futures = lazy_import("concurrent.futures")
 
 
 pattern = re.compile(r'(mul\(\d+,\d+\)|do\(\)|don\'t\(\))')
 
+# A token cut off by the end of a chunk: a prefix of one of the above, running to the end.
+partial = re.compile(r'(?:m(?:u(?:l(?:\((?:\d+(?:,\d*)?)?)?)?)?|d(?:o(?:\(|n(?:\'(?:t\(?)?)?)?)?)\Z')
+
+
+def tokens(chunks: Iterable[str]) -> Generator[str, None, None]:
+    """`pattern.findall` over a stream of chunks, as if they were one string.
+
+    Whatever could still turn into a token once the next chunk arrives (`mul(12,`
+    with `34)` still to come) is carried over to the next chunk, the rest of the
+    chunk is dropped. So memory stays at about one chunk, however long the input.
+    """
+    carry = ""
+    for chunk in chunks:
+        buffer = carry + chunk
+
+        end = 0
+        for m in pattern.finditer(buffer):
+            yield m.group()
+            end = m.end()
+
+        cut = partial.search(buffer, end)
+        carry = buffer[cut.start():] if cut else ""
+
+    # a token can't be left unfinished at the very end, so nothing's lost with the carry
+
+
+def read_chunks(f: TextIO, size: int) -> Generator[str, None, None]:
+    while chunk := f.read(size):
+        yield chunk
+
+
+def operands(instruction: str) -> Tuple[int, int]:
+    """The two numbers of a `mul(l,r)` token"""
+    l, r = instruction[4:-1].split(",")
+    return int(l), int(r)
+
+
+def evaluate(instructions: Iterable[str]) -> int:
+    """Apply the `mul` instructions to the running total, toggling on
+    'do()' and off on 'don't()'."""
+    allow = True
+    total = 0
+    for m in instructions:
+        match m:
+            case "do()":
+                allow = True
+            case "don't()":
+                allow = False
+            case _:
+                if allow:
+                    l, r = operands(m)
+                    total += l * r
+
+    return total
+
+
+# Total if the chunk is entered enabled, total if it's entered disabled, and
+# whether it leaves enabled (None: no do()/don't() in it, it leaves as it came).
+Summary = Tuple[int, int, Optional[bool]]
+
+# Bytes that can be part of a token. A chunk boundary anywhere else can't cut one in two.
+TOKEN_BYTES = frozenset(b"mul(),don't0123456789")
+
+# Where a chunk can start: ASCII bytes that aren't part of a token. Never in the
+# middle of a multi-byte UTF-8 character, so every chunk decodes on its own.
+CUT_BYTES = frozenset(range(0x80)) - TOKEN_BYTES
+
+
+def summarize(instructions: Iterable[str]) -> Summary:
+    """`evaluate` for both possible states on the way in, at once"""
+    enabled, disabled = 0, 0
+    allow = None
+    for m in instructions:
+        match m:
+            case "do()":
+                allow = True
+            case "don't()":
+                allow = False
+            case _:
+                l, r = operands(m)
+                if allow is None:
+                    # still depends on how the chunk was entered
+                    enabled += l * r
+                elif allow:
+                    enabled += l * r
+                    disabled += l * r
+
+    return enabled, disabled, allow
+
+
+def combine(summaries: Iterable[Summary]) -> int:
+    """Left fold of chunk summaries, in input order"""
+    allow = True
+    total = 0
+    for enabled, disabled, leaves in summaries:
+        total += enabled if allow else disabled
+        if leaves is not None:
+            allow = leaves
+
+    return total
+
+
+def boundaries(fp: str, chunk_size: int) -> List[int]:
+    """Offsets splitting the file into chunks of about `chunk_size` bytes, each
+    moved forward onto the next ASCII byte that can't be part of a token"""
+    size = os.path.getsize(fp)
+    offsets = [0]
+    with open(fp, "rb") as f:
+        for offset in range(chunk_size, size, chunk_size):
+            offset = max(offset, offsets[-1])
+            f.seek(offset)
+            while block := f.read(4096):
+                safe = next((i for i, b in enumerate(block) if b in CUT_BYTES), None)
+                if safe is not None:
+                    offsets.append(offset + safe)
+                    break
+                offset += len(block)
+
+    offsets.append(size)
+    return sorted(set(offsets))
+
+
+def summarize_range(fp: str, start: int, end: int) -> Summary:
+    with open(fp, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return summarize(tokens([data.decode()]))
+
 
 @time_it
 def main(data: str) -> int:
@@ -14,23 +149,58 @@ def main(data: str) -> int:
     Has the ability to "toggle" the dot product process
     as it finds 'do()' or 'don't()' k/w within the input.
     """
-    allow = True
-    total = 0
-    for line in data.splitlines():
-        for m in pattern.findall(line):
-            match m:
-                case "do()":
-                    allow = True
-                case "don't()":
-                    allow = False
-                case _:
-                    if allow:
-                        l, r = m.replace("mul(", "").replace(")", "").split(",")
-                        total += int(l) * int(r)
+    # tokens never span lines, so the whole input works as a single chunk
+    return evaluate(tokens([data]))
 
-    return total
+
+def stream(f: TextIO, chunk_size: int = 2**20) -> int:
+    """Same as `main`, reading from a file (or pipe) `chunk_size` characters at a time.
+
+    Not `time_it`-decorated: f can only be read once, so it can't be warmed up,
+    repeated or looked up in the result cache. `timed_stream` times it once.
+    """
+    return evaluate(tokens(read_chunks(f, chunk_size)))
+
+
+def timed_stream(f: TextIO) -> int:
+    """`stream`, timed like a single `time_it` call"""
+    result, timing = measure(stream, (f,), {}, Benchmark(), name=f"{__name__}.stream")
+    print(timing)
+    return result
+
+
+@time_it(files=("fp",))
+def parallel(fp: str, chunk_size: int = 64 * 2**20, workers: Optional[int] = None) -> int:
+    """Same as `main`, straight from a file and spread over a process pool.
+
+    The do()/don't() toggle makes a plain scan sequential, but a chunk can be
+    summarized without knowing the state it's entered in: its total for either
+    state, and the state it leaves in. Chunks are split where no token can be cut
+    in two, summarized in parallel, and folded back together in order.
+    """
+    offsets = boundaries(fp, chunk_size)
+    with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = pool.map(
+            summarize_range,
+            [fp] * (len(offsets) - 1),
+            offsets[:-1],
+            offsets[1:],
+        )
+        return combine(summaries)
 
 
 if __name__ == "__main__":
-    print(main(read_input(input_path(__file__).replace(".txt", "_practice.txt"))))
-    print(main(read_input(input_path(__file__))))
+    if len(sys.argv) > 2 and sys.argv[1] == "--parallel":
+        # python part_2.py --parallel <input> [chunk MiB]
+        chunk_size = int(float(sys.argv[3]) * 2**20) if len(sys.argv) > 3 else 64 * 2**20
+        print(parallel(sys.argv[2], chunk_size=chunk_size))
+    elif len(sys.argv) > 1:
+        # python part_2.py <input, or - for stdin>
+        if sys.argv[1] == "-":
+            print(timed_stream(sys.stdin))
+        else:
+            with open(sys.argv[1]) as f:
+                print(timed_stream(f))
+    else:
+        print(main(read_input(input_path(__file__).replace(".txt", "_practice.txt"))))
+        print(main(read_input(input_path(__file__))))
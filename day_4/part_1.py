@@ -1,88 +1,213 @@
-from __future__ import annotations
-
-from dataclasses import (dataclass)
-from typing import List, Callable, Optional
-from functools import partial
+from collections import deque
+import sys
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
 
+from lazy import lazy_import
 from utils import time_it, read_input, input_path
 
+np = lazy_import("numpy")
 
-def left(c: Coord): return Coord(c.x - 1, c.y)
-def right(c: Coord): return Coord(c.x + 1, c.y)
-def up(c: Coord): return Coord(c.x, c.y - 1)
-def down(c: Coord): return Coord(c.x, c.y + 1)
 
+WORD = b"XMAS"
 
-def move(c: Coord, fns: List[Callable[[Coord], Coord]]):
-    if not fns:
-        return c
+# (dy, dx), increasing y goes down
+DIRECTIONS: Tuple[Tuple[int, int], ...] = (
+    (-1, 0), (0, 1), (1, 0), (0, -1),
+    (-1, -1), (-1, 1), (1, 1), (1, -1),
+)
 
-    return move(fns[0](c), fns[1:])
 
+def letters(data: str) -> "np.ndarray":
+    """The word search as a (rows, columns) uint8 array"""
+    lines = data.splitlines()
+    return np.frombuffer("".join(lines).encode(), dtype=np.uint8).reshape(len(lines), -1)
 
-@dataclass
-class Coord:
-    x: int
-    y: int
 
+def count_direction(grid: "np.ndarray", word: bytes, dy: int, dx: int) -> int:
+    """How many times word starts somewhere in the grid and runs along (dy, dx)"""
+    height, width = grid.shape
+    span = len(word) - 1
+
+    # the starts the whole word fits in front of
+    rows, cols = height - span * abs(dy), width - span * abs(dx)
+    if rows <= 0 or cols <= 0:
+        return 0
+    y0, x0 = span * max(-dy, 0), span * max(-dx, 0)
 
-class Plane:
-    def __init__(self, data: List[List[str]]):
-        self.data = data
-        self.shape = len(data), len(data[0])
+    found = np.ones((rows, cols), dtype=bool)
+    for n, letter in enumerate(word):
+        y, x = y0 + n * dy, x0 + n * dx
+        found &= grid[y:y + rows, x:x + cols] == letter
+    return int(found.sum())
 
-    def _exists(self, c: Coord):
-        return 0 <= c.y < self.shape[0] and 0 <= c.x < self.shape[1]
 
-    def __getitem__(self, item: Coord) -> Optional[str]:
-        if self._exists(item):
-            return self.data[item.y][item.x]
+def count_all(grid: "np.ndarray", word: bytes = WORD) -> int:
+    """Occurrences of word in all 8 directions, each one a handful of shifted slice compares"""
+    return sum(count_direction(grid, word, dy, dx) for dy, dx in DIRECTIONS)
 
-    def __iter__(self):
-        for y in range(self.shape[0]):
-            for x in range(self.shape[1]):
-                yield Coord(x, y)
 
-    def take(self, c: Coord, direction: Callable[[Coord], Coord], n: int) -> str:
-        """Take n values of the plane in any given direction, starting at c"""
+@time_it
+def main(data: str) -> int:
+    return count_all(letters(data))
+
+
+# Many words at once: an Aho-Corasick automaton over the words, run over every
+# row, column and diagonal of the grid.
+
+class Automaton(NamedTuple):
+    # delta[state][byte], the next state. A full DFA, the failure links are
+    # already folded in, so each letter is one list lookup
+    delta: List[List[int]]
+    # the patterns ending in each state: (word index, reversed?)
+    out: List[Tuple[Tuple[int, bool], ...]]
+    # length of each word
+    lengths: List[int]
+
+
+def build(words: List[bytes]) -> Automaton:
+    """Aho-Corasick automaton matching every word, forwards and backwards
+
+    Matching the reversed words too covers both directions along a line in a
+    single pass over it. A palindrome is both, so it counts once each way, like
+    `count_all` does.
+    """
+    goto: List[Dict[int, int]] = [{}]
+    out: List[List[Tuple[int, bool]]] = [[]]
+    for i, word in enumerate(words):
+        if not word:
+            raise ValueError("can't search for an empty word")
+        for pattern, backwards in ((word, False), (word[::-1], True)):
+            state = 0
+            for c in pattern:
+                if c not in goto[state]:
+                    goto.append({})
+                    out.append([])
+                    goto[state][c] = len(goto) - 1
+                state = goto[state][c]
+            out[state].append((i, backwards))
+
+    # breadth first, so a state's failure target is always done before it
+    delta = [[0] * 256 for _ in goto]
+    fail = [0] * len(goto)
+    queue = deque()
+    for c, child in goto[0].items():
+        delta[0][c] = child
+        queue.append(child)
+    while queue:
+        state = queue.popleft()
+        delta[state] = delta[fail[state]].copy()
+        out[state] += out[fail[state]]
+        for c, child in goto[state].items():
+            fail[child] = delta[fail[state]][c]
+            delta[state][c] = child
+            queue.append(child)
+
+    return Automaton(delta, [tuple(o) for o in out], [len(w) for w in words])
+
+
+# a line through the grid: its letters, first cell (x, y) and step (dx, dy)
+Line = Tuple[bytes, int, int, int, int]
+
+
+def lines(rows: List[bytes]) -> Iterator[Line]:
+    """Every row, column, diagonal and anti-diagonal, each read one way only.
+
+    All of them are strided slices of the flattened grid.
+    """
+    height, width = len(rows), len(rows[0]) if rows else 0
+    flat = b"".join(rows)
+
+    for y in range(height):
+        yield flat[y * width:(y + 1) * width], 0, y, 1, 0
+    for x in range(width):
+        yield flat[x::width], x, 0, 0, 1
+
+    # down-right, starting along the top row, then down the left column
+    for x0, y0 in [(x, 0) for x in range(width)] + [(0, y) for y in range(1, height)]:
+        n = min(width - x0, height - y0)
+        start = y0 * width + x0
+        yield flat[start:start + (n - 1) * (width + 1) + 1:width + 1], x0, y0, 1, 1
+
+    # down-left, starting along the top row, then down the right column
+    for x0, y0 in [(x, 0) for x in range(width)] + [(width - 1, y) for y in range(1, height)]:
+        n = min(x0 + 1, height - y0)
+        start = y0 * width + x0
         if n == 1:
-            return self[c] or ""
-        return (self[c] or "") + self.take(direction(c), direction, n - 1)
+            yield flat[start:start + 1], x0, y0, -1, 1
+        else:
+            yield flat[start:start + (n - 1) * (width - 1) + 1:width - 1], x0, y0, -1, 1
 
 
-directions = [
-    left, right, up, down,
-    partial(move, fns=[left, up]),
-    partial(move, fns=[right, up]),
-    partial(move, fns=[left, down]),
-    partial(move, fns=[right, down]),
-]
+class Hit(NamedTuple):
+    # first letter of the word, and the direction it's read in
+    x: int
+    y: int
+    dx: int
+    dy: int
 
 
-def count_occurrences(plane: Plane, coord: Coord) -> int:
-    """Starting at coord, how many 'XMAS's appear in all directions?"""
-    total = 0
+def matches(automaton: Automaton, line: bytes) -> Iterator[Tuple[int, Tuple[Tuple[int, bool], ...]]]:
+    """(position of the last letter, patterns ending there) along the line"""
+    delta, out = automaton.delta, automaton.out
+    state = 0
+    for k, c in enumerate(line):
+        state = delta[state][c]
+        if out[state]:
+            yield k, out[state]
 
-    for d in directions:
-        phrase = plane.take(coord, d, n=4)
-        if phrase == "XMAS":
-            total += 1
 
-    return total
+def parse_words(words: Iterable[str]) -> List[str]:
+    # duplicates would only be found twice
+    return list(dict.fromkeys(w.strip() for w in words if w.strip()))
 
 
 @time_it
-def main(data: str) -> int:
-    plane = Plane([list(line) for line in data.splitlines()])
+def search(data: str, words: List[str]) -> Dict[str, int]:
+    """How many times each word appears in the grid, in any of the 8 directions.
+
+    Each line of the grid goes through the automaton once, so the cost is the
+    size of the grid plus the number of hits, whatever the number of words.
+    """
+    words = parse_words(words)
+    automaton = build([w.encode() for w in words])
+
+    counts = [0] * len(words)
+    for line, *_ in lines([row.encode() for row in data.splitlines()]):
+        for _, found in matches(automaton, line):
+            for i, _ in found:
+                counts[i] += 1
+
+    return dict(zip(words, counts))
+
+
+@time_it
+def locate(data: str, words: List[str]) -> Dict[str, List[Hit]]:
+    """Like `search`, but where: the first letter and direction of every hit"""
+    words = parse_words(words)
+    automaton = build([w.encode() for w in words])
 
-    count = 0
-    for coord in plane:
-        if plane[coord] == "X":
-            count += count_occurrences(plane, coord)
+    hits: List[List[Hit]] = [[] for _ in words]
+    for line, x0, y0, dx, dy in lines([row.encode() for row in data.splitlines()]):
+        for k, found in matches(automaton, line):
+            for i, backwards in found:
+                if backwards:
+                    # read against the line, starting at its last letter
+                    hits[i].append(Hit(x0 + k * dx, y0 + k * dy, -dx, -dy))
+                else:
+                    k0 = k - automaton.lengths[i] + 1
+                    hits[i].append(Hit(x0 + k0 * dx, y0 + k0 * dy, dx, dy))
 
-    return count
+    return dict(zip(words, hits))
 
 
 if __name__ == "__main__":
-    print(main(read_input(input_path(__file__).replace(".txt", "_practice.txt"))))
-    print(main(read_input(input_path(__file__))))
+    if len(sys.argv) > 2 and sys.argv[1] == "--words":
+        # python part_1.py --words <word list, one per line> [grid]
+        with open(sys.argv[2]) as f:
+            word_list = f.read().splitlines()
+        grid = read_input(sys.argv[3] if len(sys.argv) > 3 else input_path(__file__))
+        for word, count in search(grid, word_list).items():
+            print(word, count)
+    else:
+        print(main(read_input(input_path(__file__).replace(".txt", "_practice.txt"))))
+        print(main(read_input(input_path(__file__))))
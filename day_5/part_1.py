@@ -1,31 +1,71 @@
 from __future__ import annotations
 
+from typing import List, Tuple
+
+from lazy import lazy_import
 from utils import time_it, read_input, input_path
 
+np = lazy_import("numpy")
+
+
+# page numbers are two digits
+PAGES = 100
+
+
+def rule_graph(rules_raw: str) -> List[int]:
+    """The rules as an adjacency bitset: after[p] has bit q set for every rule `p|q`"""
+    after = [0] * PAGES
+    for line in rules_raw.splitlines():
+        left, right = map(int, line.split("|"))
+        after[left] |= 1 << right
+    return after
+
+
+# Pages as bits of two uint64 words: lo for pages 0-63, hi for 64-99.
+# Updates are padded with PAD, which has no bits, so it's never ruled
+# before or after anything.
+PAD = PAGES
+
+# Updates validated per NumPy call, so millions of them never need one huge array
+BATCH = 2**16
+
+Words = Tuple["np.ndarray", "np.ndarray"]
 
-class Node:
-    def __init__(self, value: int):
-        self.value = value
-        self.lt = set()
-        self.gt = set()
 
-    def __eq__(self, other: Node):
-        return self.value == other.value
+def words(masks: List[int]) -> Words:
+    """Bitsets indexed by page (and PAD) as a lo and a hi uint64 array"""
+    masks = masks + [0]
+    return (
+        np.array([m & (2**64 - 1) for m in masks], dtype=np.uint64),
+        np.array([m >> 64 for m in masks], dtype=np.uint64),
+    )
 
-    def __ne__(self, other: Node):
-        return not self == other
 
-    def __hash__(self):
-        return self.value
+BITS = [1 << p for p in range(PAGES)]
 
-    def __repr__(self):
-        return f'Node({self.value})'
 
-    def __lt__(self, other: Node):
-        return other in self.lt
+def updates(lines: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """All updates as one (updates, longest update) array, padded with PAD,
+    and the length of each update."""
+    lengths = np.array([line.count(",") + 1 for line in lines], dtype=np.int64)
+    pages = np.full((len(lines), lengths.max(initial=0)), PAD, dtype=np.int64)
 
-    def __gt__(self, other):
-        return other in self.gt
+    # filled row by row, in the same order the pages are read
+    pages[np.arange(pages.shape[1]) < lengths[:, None]] = np.fromstring(",".join(lines), dtype=np.int64, sep=",")
+    return pages, lengths
+
+
+def valid_all(pages: "np.ndarray", after: Words, bits: Words) -> "np.ndarray":
+    """Whether each (padded) update is in order, for all of them at once.
+
+    Running left to right, the pages seen so far are a prefix OR of their bits.
+    An update is out of order as soon as a page is ruled before one already seen.
+    """
+    clash = np.zeros(pages.shape[0], dtype=bool)
+    for after_word, bits_word in zip(after, bits):
+        seen = np.bitwise_or.accumulate(bits_word[pages], axis=1)
+        clash |= (after_word[pages[:, 1:]] & seen[:, :-1]).any(axis=1)
+    return ~clash
 
 
 @time_it
@@ -35,15 +75,11 @@ def main(data: str) -> int:
     by the initial rules. Determine if the raw page is
     sorted correctly based on the rules.
 
-    Solve through creating a pseudo-graph of the rules.
     Each rule has two parts, like: `47|31`.
     In this rule, 47 comes before 31.
-    Create a "node" of each side, and keep track of
-    this comparison. For node 47, note that it is lt node 31,
-    and vice-versa. Each node supports comparison operators
-    for measuring equality/lt/gt, etc. This makes it so that
-    if you have a list of nodes, you can just use the base-python
-    sorting to put them in the right order.
+    The rules are kept as a bitset of successors per
+    page number, and the updates are checked in batches
+    against the pages already seen, instead of being sorted.
 
     :param data:
     :return int: the sum of the "middle" value for each correct page
@@ -51,27 +87,14 @@ def main(data: str) -> int:
 
     rules_raw, pages_raw = data.split("\n\n")
 
-    graph = {}
-    for line in rules_raw.splitlines():
-        left, right = map(int, line.split("|"))
-        if left not in graph:
-            graph[left] = Node(left)
-
-        if right not in graph:
-            graph[right] = Node(right)
-
-        graph[left].lt.add(graph[right])
-        graph[right].gt.add(graph[left])
+    after, bits = words(rule_graph(rules_raw)), words(BITS)
 
+    lines = pages_raw.splitlines()
     total = 0
-    for line in pages_raw.splitlines():
-        page = [int(v) for v in line.split(",")]
-        nodes = [graph[n] for n in page]
-
-        s = [n.value for n in sorted(nodes)]
-
-        if s == page:
-            total += page[len(page) // 2]
+    for start in range(0, len(lines), BATCH):
+        pages, lengths = updates(lines[start:start + BATCH])
+        middles = pages[np.arange(len(pages)), lengths // 2]
+        total += int(middles[valid_all(pages, after, bits)].sum())
 
     return total
 
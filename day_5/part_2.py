@@ -1,31 +1,137 @@
 from __future__ import annotations
 
+from collections import deque
+from typing import List, Tuple
+
+from lazy import lazy_import
 from utils import time_it, read_input, input_path
 
+np = lazy_import("numpy")
+
+
+# page numbers are two digits
+PAGES = 100
+
+
+def rule_graph(rules_raw: str) -> Tuple[List[int], List[int]]:
+    """The rules as two adjacency bitsets: after[p] has bit q set for every rule
+    `p|q`, before[q] has bit p set."""
+    after = [0] * PAGES
+    before = [0] * PAGES
+    for line in rules_raw.splitlines():
+        left, right = map(int, line.split("|"))
+        after[left] |= 1 << right
+        before[right] |= 1 << left
+    return after, before
 
-class Node:
-    def __init__(self, value: int):
-        self.value = value
-        self.lt = set()
-        self.gt = set()
 
-    def __eq__(self, other: Node):
-        return self.value == other.value
+# Pages as bits of two uint64 words: lo for pages 0-63, hi for 64-99.
+# Updates are padded with PAD, which has no bits, so it's never ruled
+# before or after anything.
+PAD = PAGES
 
-    def __ne__(self, other: Node):
-        return not self == other
+# Updates validated per NumPy call, so millions of them never need one huge array
+BATCH = 2**16
 
-    def __hash__(self):
-        return self.value
+Words = Tuple["np.ndarray", "np.ndarray"]
 
-    def __repr__(self):
-        return f'Node({self.value})'
 
-    def __lt__(self, other: Node):
-        return other in self.lt
+def words(masks: List[int]) -> Words:
+    """Bitsets indexed by page (and PAD) as a lo and a hi uint64 array"""
+    masks = masks + [0]
+    return (
+        np.array([m & (2**64 - 1) for m in masks], dtype=np.uint64),
+        np.array([m >> 64 for m in masks], dtype=np.uint64),
+    )
 
-    def __gt__(self, other):
-        return other in self.gt
+
+BITS = [1 << p for p in range(PAGES)]
+
+
+def updates(lines: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """All updates as one (updates, longest update) array, padded with PAD,
+    and the length of each update."""
+    lengths = np.array([line.count(",") + 1 for line in lines], dtype=np.int64)
+    pages = np.full((len(lines), lengths.max(initial=0)), PAD, dtype=np.int64)
+
+    # filled row by row, in the same order the pages are read
+    pages[np.arange(pages.shape[1]) < lengths[:, None]] = np.fromstring(",".join(lines), dtype=np.int64, sep=",")
+    return pages, lengths
+
+
+def valid_all(pages: "np.ndarray", after: Words, bits: Words) -> "np.ndarray":
+    """Whether each (padded) update is in order, for all of them at once.
+
+    Running left to right, the pages seen so far are a prefix OR of their bits.
+    An update is out of order as soon as a page is ruled before one already seen.
+    """
+    clash = np.zeros(pages.shape[0], dtype=bool)
+    for after_word, bits_word in zip(after, bits):
+        seen = np.bitwise_or.accumulate(bits_word[pages], axis=1)
+        clash |= (after_word[pages[:, 1:]] & seen[:, :-1]).any(axis=1)
+    return ~clash
+
+
+def mask(page: List[int]) -> int:
+    pages = 0
+    for p in page:
+        pages |= 1 << p
+    return pages
+
+
+def order(page: List[int], after: List[int], before: List[int]) -> List[int]:
+    """The update put in order: Kahn's algorithm on the rule graph restricted
+    to the update's pages"""
+    pages = mask(page)
+
+    # in-degree within the update
+    waiting = {p: (before[p] & pages).bit_count() for p in page}
+    ready = deque(p for p in page if not waiting[p])
+    ordered = []
+    while ready:
+        p = ready.popleft()
+        ordered.append(p)
+
+        successors = after[p] & pages
+        while successors:
+            bit = successors & -successors
+            successors ^= bit
+            q = bit.bit_length() - 1
+            waiting[q] -= 1
+            if not waiting[q]:
+                ready.append(q)
+
+    return ordered
+
+
+def ranks_all(pages: "np.ndarray", before: Words, bits: Words) -> "np.ndarray":
+    """Rank of every page within its (padded) update: how many of the update's
+    pages are ruled before it, a popcount each. PAD ranks PAGES."""
+    ranks = np.zeros(pages.shape, dtype=np.int64)
+    for before_word, bits_word in zip(before, bits):
+        update = np.bitwise_or.reduce(bits_word[pages], axis=1)
+        ranks += np.bitwise_count(before_word[pages] & update[:, None])
+    ranks[pages == PAD] = PAGES
+    return ranks
+
+
+def middles_all(pages: "np.ndarray", lengths: "np.ndarray", after: List[int], before: List[int], bits: Words) -> "np.ndarray":
+    """The middle page of every (padded) update once it's ordered, one per row.
+
+    That's the page with half the update's pages ruled before it. Updates whose
+    ranks don't come out as 0..length-1 are put through `order` instead.
+    """
+    ranks = ranks_all(pages, words(before), bits)
+    rows = np.arange(len(pages))
+    middles = pages[rows, np.argmax(ranks == (lengths // 2)[:, None], axis=1)]
+
+    # the ranks of an update's pages should be 0..length-1, otherwise order it
+    columns = np.arange(pages.shape[1])
+    apart = ((np.sort(ranks, axis=1) == columns) | (columns >= lengths[:, None])).all(axis=1)
+    for r in np.flatnonzero(~apart):
+        middles[r] = order(pages[r, :lengths[r]].tolist(), after, before)[lengths[r] // 2]
+
+    return middles
 
 
 @time_it
@@ -35,15 +141,13 @@ def main(data: str) -> int:
     by the initial rules. Determine if the raw page is
     sorted correctly based on the rules.
 
-    Solve through creating a pseudo-graph of the rules.
     Each rule has two parts, like: `47|31`.
     In this rule, 47 comes before 31.
-    Create a "node" of each side, and keep track of
-    this comparison. For node 47, note that it is lt node 31,
-    and vice-versa. Each node supports comparison operators
-    for measuring equality/lt/gt, etc. This makes it so that
-    if you have a list of nodes, you can just use the base-python
-    sorting to put them in the right order.
+    The rules are kept as a bitset of successors (and
+    one of predecessors) per page number. The updates are
+    checked in batches against the pages already seen, and
+    an out of order one is never sorted: the middle page is
+    the one with half the update's pages ruled before it.
 
     :param data:
     :return int: the sum of the "middle" value for each incorrect
@@ -51,28 +155,15 @@ def main(data: str) -> int:
     """
 
     rules_raw, pages_raw = data.split("\n\n")
+    after, before = rule_graph(rules_raw)
+    after_words, bits = words(after), words(BITS)
 
-    graph = {}
-    for line in rules_raw.splitlines():
-        left, right = map(int, line.split("|"))
-        if left not in graph:
-            graph[left] = Node(left)
-
-        if right not in graph:
-            graph[right] = Node(right)
-
-        graph[left].lt.add(graph[right])
-        graph[right].gt.add(graph[left])
-
+    lines = pages_raw.splitlines()
     total = 0
-    for line in pages_raw.splitlines():
-        page = [int(v) for v in line.split(",")]
-        nodes = [graph[n] for n in page]
-
-        s = [n.value for n in sorted(nodes)]
-
-        if s != page:
-            total += s[len(s) // 2]
+    for start in range(0, len(lines), BATCH):
+        pages, lengths = updates(lines[start:start + BATCH])
+        wrong = ~valid_all(pages, after_words, bits)
+        total += int(middles_all(pages[wrong], lengths[wrong], after, before, bits).sum())
 
     return total
 
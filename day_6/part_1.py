@@ -1,96 +1,87 @@
-from __future__ import annotations
-
-from dataclasses import (dataclass)
-from typing import List, Optional
+import bisect
+from typing import List, Tuple
 
+from grid import Grid
 from utils import time_it, read_input, input_path
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
+OBSTRUCTION = ord("#")
 
-    def __hash__(self):
-        return hash((self.x, self.y))
+# obstructions[y] holds the x of every obstruction on row y, in order, and
+# the other way round for the columns
+Lines = Tuple[List[List[int]], List[List[int]]]
 
-    def move(self, direction: Coord) -> Coord:
-        return Coord(x=self.x + direction.x, y=self.y + direction.y)
 
+def parse(data: str) -> (Grid, int, int):
+    """Determine the map/layout and the pointer (security guard).
+    Returns the grid, and the guard's position and direction"""
+    grid = Grid.parse(data)
 
-class Plane:
-    def __init__(self, data: List[List[str]]):
-        self.data = data
-        self.shape = len(data), len(data[0])
+    for value, direction in zip("^>v<", grid.directions):
+        position = grid.find(value)
+        if position != -1:
+            grid[position] = "."
+            return grid, position, direction
 
-    def _exists(self, c: Coord):
-        return 0 <= c.y < self.shape[0] and 0 <= c.x < self.shape[1]
+    raise Exception("Bad match")
 
-    def __getitem__(self, item: Coord) -> Optional[str]:
-        if not self._exists(item):
-            raise IndexError()
 
-        return self.data[item.y][item.x]
+def obstructions(grid: Grid) -> Lines:
+    """The sorted obstruction lists of every row and column"""
+    rows: List[List[int]] = [[] for _ in range(grid.height)]
+    columns: List[List[int]] = [[] for _ in range(grid.width)]
+    for i in grid.find_all(OBSTRUCTION):
+        x, y = grid.xy(i)
+        rows[y].append(x)
+        columns[x].append(y)
+    return rows, columns
 
 
-@dataclass
-class SecurityGuard:
-    position: Coord
-    direction: Coord
+def jump(grid: Grid, lines: Lines, position: int, direction: int) -> Tuple[int, bool]:
+    """Where the guard stops walking straight from position: the cell in front
+    of the next obstruction (False), or the last one on the map (True).
 
-    def pivot(self):
-        """Turn right, in place :sad-panda:
-        This is the inverse of a traditional pivot, since
-        increasing y goes down (list-indexing)
-        """
-        self.direction = Coord(x=-self.direction.y, y=self.direction.x)
+    A bisect into the row or column's obstructions, however far that is.
+    """
+    x, y = grid.xy(position)
+    if direction == grid.left or direction == grid.right:
+        line, at, end = lines[0][y], x, grid.width - 1
+    else:
+        line, at, end = lines[1][x], y, grid.height - 1
 
-    def front(self) -> Coord:
-        return self.position.move(self.direction)
+    # right and down go up the line, left and up down it
+    if direction > 0:
+        k = bisect.bisect_right(line, at)
+        free, leaves = (line[k] - at - 1, False) if k < len(line) else (end - at, True)
+    else:
+        k = bisect.bisect_left(line, at)
+        free, leaves = (at - line[k - 1] - 1, False) if k else (at, True)
 
-    def step(self):
-        self.position = self.front()
+    return position + direction * free, leaves
 
 
 @time_it
 def main(data: str) -> int:
-    grid = []
-    guard: SecurityGuard = ...
-
-    # parsing. Determine the map/layout and the pointer (security guard)
-    for y, line in enumerate(data.splitlines()):
-        row = []
-        for x, value in enumerate(line):
-            match value:
-                case "." | "#": row.append(value)
-                case _:
-                    row.append(".")
-                    c = Coord(x=x, y=y)
-                    match value:
-                        case "^": d = Coord(x=0, y=-1)
-                        case ">": d = Coord(x=1, y=0)
-                        case "v": d = Coord(x=0, y=1)
-                        case "<": d = Coord(x=-1, y=0)
-                        case _: raise Exception("Bad match")
-                    guard = SecurityGuard(position=c, direction=d)
-        grid.append(row)
-
-    plane = Plane(grid)
-    visited = {guard.position}
+    """Walk the guard one straight run at a time, from obstruction to obstruction,
+    marking each run's cells with a single slice assignment"""
+    grid, position, direction = parse(data)
+    lines = obstructions(grid)
+    visited = bytearray(len(grid.cells))
 
     while True:
-        try:
-            value = plane[guard.front()]
+        stop, leaves = jump(grid, lines, position, direction)
+
+        step = abs(direction)
+        first, last = min(position, stop), max(position, stop)
+        visited[first:last + 1:step] = b"\x01" * ((last - first) // step + 1)
+
         # no longer in the map, you're done
-        except IndexError:
-            return len(visited)
-        else:
-            match value:
-                case ".":
-                    guard.step()
-                    visited.add(guard.position)
-                case "#":
-                    guard.pivot()
+        if leaves:
+            return visited.count(1)
+
+        # turn right :sad-panda:
+        direction = grid.right_of[direction]
+        position = stop
 
 
 if __name__ == "__main__":
@@ -1,123 +1,129 @@
-from __future__ import annotations
-
-from collections import defaultdict
-from copy import deepcopy
-from dataclasses import (dataclass)
-from typing import List, Optional, Set, Dict
+import bisect
+from typing import List, Optional, Set, Tuple
 
+from grid import Grid
 from utils import time_it, read_input, input_path
 
 
-@dataclass
-class Coord:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def move(self, direction: Coord) -> Coord:
-        return Coord(x=self.x + direction.x, y=self.y + direction.y)
-
-
-class Plane:
-    def __init__(self, data: List[List[str]]):
-        self.data = data
-        self.shape = len(data), len(data[0])
-
-    def _exists(self, c: Coord):
-        return 0 <= c.y < self.shape[0] and 0 <= c.x < self.shape[1]
-
-    def __getitem__(self, item: Coord) -> Optional[str]:
-        if not self._exists(item):
-            raise IndexError()
+OBSTRUCTION = ord("#")
 
-        return self.data[item.y][item.x]
 
-    def with_obstruction(self, at: Coord) -> Plane:
-        copy = deepcopy(self.data)
-        copy[at.y][at.x] = "#"
-        return Plane(copy)
+# obstructions[y] holds the x of every obstruction on row y, in order, and
+# the other way round for the columns
+Lines = Tuple[List[List[int]], List[List[int]]]
 
 
-@dataclass
-class SecurityGuard:
-    position: Coord
-    direction: Coord
-
-    def pivot(self):
-        """Turn right, in place :sad-panda:
-        This is the inverse of a traditional pivot, since
-        increasing y goes down (list-indexing)
-        """
-        self.direction = Coord(x=-self.direction.y, y=self.direction.x)
+class InfiniteLoopException(Exception): pass
 
-    def front(self) -> Coord:
-        return self.position.move(self.direction)
 
-    def step(self):
-        self.position = self.front()
+def parse(data: str) -> (Grid, int, int):
+    """Determine the map/layout and the pointer (security guard).
+    Returns the grid, and the guard's position and direction"""
+    grid = Grid.parse(data)
+
+    for value, direction in zip("^>v<", grid.directions):
+        position = grid.find(value)
+        if position != -1:
+            grid[position] = "."
+            return grid, position, direction
+
+    raise Exception("Bad match")
+
+
+def obstructions(grid: Grid) -> Lines:
+    """The sorted obstruction lists of every row and column"""
+    rows: List[List[int]] = [[] for _ in range(grid.height)]
+    columns: List[List[int]] = [[] for _ in range(grid.width)]
+    for i in grid.find_all(OBSTRUCTION):
+        x, y = grid.xy(i)
+        rows[y].append(x)
+        columns[x].append(y)
+    return rows, columns
+
+
+def jump(grid: Grid, lines: Lines, position: int, direction: int, extra: Optional[int] = None) -> Tuple[int, bool]:
+    """Where the guard stops walking straight from position: the cell in front
+    of the next obstruction (False), or the last one on the map (True).
+
+    A bisect into the row or column's obstructions, however far that is. `extra`
+    is one more obstruction, that isn't in the lists.
+    """
+    x, y = grid.xy(position)
+    ex, ey = grid.xy(extra) if extra is not None else (-1, -1)
+    if direction == grid.left or direction == grid.right:
+        line, at, end = lines[0][y], x, grid.width - 1
+        extra_at = ex if ey == y else None
+    else:
+        line, at, end = lines[1][x], y, grid.height - 1
+        extra_at = ey if ex == x else None
+
+    # right and down go up the line, left and up down it
+    if direction > 0:
+        k = bisect.bisect_right(line, at)
+        free, leaves = (line[k] - at - 1, False) if k < len(line) else (end - at, True)
+    else:
+        k = bisect.bisect_left(line, at)
+        free, leaves = (at - line[k - 1] - 1, False) if k else (at, True)
+
+    if extra_at is not None:
+        gap = (extra_at - at if direction > 0 else at - extra_at) - 1
+        if 0 <= gap < free:
+            free, leaves = gap, False
+
+    return position + direction * free, leaves
+
+
+def emulate(grid: Grid, lines: Lines, position: int, direction: int, extra: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """The guard's walk as straight runs, (from, to, direction), jumping from one
+    turn to the next. The guard is looping once it turns the same way at the same
+    spot twice."""
+    runs = []
+    turns: Set[Tuple[int, int]] = set()
 
+    while True:
+        stop, leaves = jump(grid, lines, position, direction, extra)
+        runs.append((position, stop, direction))
 
-class InfiniteLoopException(Exception): pass
+        # no longer in the map, you're done
+        if leaves:
+            return runs
 
+        direction = grid.right_of[direction]
+        if (stop, direction) in turns:
+            raise InfiniteLoopException()
 
-def emulate(plane: Plane, guard: SecurityGuard) -> List[Coord]:
-    visited: Dict[Coord, Set[Coord]] = defaultdict(set)
-    visited[guard.position].add(guard.direction)
+        turns.add((stop, direction))
+        position = stop
 
-    while True:
-        try:
-            value = plane[guard.front()]
-        # no longer in the map, you're done
-        except IndexError:
-            return list(visited.keys())
-        else:
-            match value:
-                case ".":
-                    guard.step()
-                case "#":
-                    guard.pivot()
 
-            if guard.direction in visited[guard.position]:
-                raise InfiniteLoopException()
+def visited(grid: Grid, runs: List[Tuple[int, int, int]]) -> List[int]:
+    """Every cell on the runs, each once"""
+    cells = bytearray(len(grid.cells))
+    for position, stop, direction in runs:
+        step = abs(direction)
+        first, last = min(position, stop), max(position, stop)
+        cells[first:last + 1:step] = b"\x01" * ((last - first) // step + 1)
 
-            visited[guard.position].add(guard.direction)
+    found = []
+    i = cells.find(1)
+    while i != -1:
+        found.append(i)
+        i = cells.find(1, i + 1)
+    return found
 
 
 @time_it
 def main(data: str) -> int:
-    grid = []
-    guard: SecurityGuard = ...
-    pointer: (Coord, Coord) = ...
-
-    # parsing. Determine the map/layout and the pointer (security guard)
-    for y, line in enumerate(data.splitlines()):
-        row = []
-        for x, value in enumerate(line):
-            match value:
-                case "." | "#": row.append(value)
-                case _:
-                    row.append(".")
-                    c = Coord(x=x, y=y)
-                    match value:
-                        case "^": d = Coord(x=0, y=-1)
-                        case ">": d = Coord(x=1, y=0)
-                        case "v": d = Coord(x=0, y=1)
-                        case "<": d = Coord(x=-1, y=0)
-                        case _: raise Exception("Bad match")
-                    pointer = c, d
-        grid.append(row)
-
-    plane = Plane(grid)
-    original_positions = emulate(plane, SecurityGuard(position=pointer[0], direction=pointer[1]))
+    grid, start, direction = parse(data)
+    lines = obstructions(grid)
+    original_positions = visited(grid, emulate(grid, lines, start, direction))
 
     loops = 0
     for position in original_positions:
-        if position != pointer[0]:
-            other_plane = plane.with_obstruction(at=position)
+        if position != start:
+            # obstruct it, only as far as the jumps can see
             try:
-                _ = emulate(other_plane, SecurityGuard(position=pointer[0], direction=pointer[1]))
+                _ = emulate(grid, lines, start, direction, extra=position)
             except InfiniteLoopException:
                 loops += 1
 
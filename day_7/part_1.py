@@ -1,5 +1,6 @@
 from typing import List
 
+import counters
 from utils import time_it, read_input, input_path
 
 
@@ -29,6 +30,11 @@ def solve(
 
     right = calibration_equations.pop(0)
 
+    stats = counters.active
+    if stats is not None:
+        stats["expanded"] += len(calibration_accumulations)
+        stats.peak("frontier_peak", len(calibration_accumulations))
+
     new_accumulations = []
     for acc in calibration_accumulations:
         for op in operators:
@@ -37,6 +43,8 @@ def solve(
                 return test_value
             if result < test_value:
                 new_accumulations.append(result)
+            elif stats is not None:
+                stats["pruned"] += 1
 
     return solve(test_value, calibration_equations, new_accumulations)
 
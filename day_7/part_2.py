@@ -1,5 +1,6 @@
 from typing import List, Callable
 
+import counters
 from utils import time_it, read_input, input_path
 
 
@@ -31,6 +32,11 @@ def solve(
     except IndexError:
         return 0
     else:
+        stats = counters.active
+        if stats is not None:
+            stats["expanded"] += len(calibration_accumulations)
+            stats.peak("frontier_peak", len(calibration_accumulations))
+
         new_accumulations = []
         for acc in sorted(calibration_accumulations, reverse=True):
             for op in ops:
@@ -39,6 +45,8 @@ def solve(
                     return test_value
                 if result < test_value:
                     new_accumulations.append(result)
+                elif stats is not None:
+                    stats["pruned"] += 1
 
         return solve(test_value, calibration_equations[1:], new_accumulations, ops=ops)
 
@@ -0,0 +1,616 @@
+"""Synthetic, puzzle-shaped inputs for every day, to see how the solvers scale.
+
+Each `day_N(size, seed)` returns an input string in the same format as
+`day_N/part_M.txt`. What `size` means depends on the day (grid side, number of
+lines, number of digits, ...), see each generator's docstring.
+
+    python generators.py 9 1000000 > disk_map.txt       # write an input
+    python generators.py 6 --part 1 --scale 50 100 200  # runtime vs. size
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import math
+import os
+import random
+import string
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from utils import Timing, benchmarking
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _grid(rows: List[List[str]]) -> str:
+    return "\n".join("".join(row) for row in rows)
+
+
+def _walled(size: int) -> List[List[str]]:
+    """size x size grid, `#` around the border and `.` inside"""
+    return [
+        ["#"] * size if y in (0, size - 1) else ["#"] + ["."] * (size - 2) + ["#"]
+        for y in range(size)
+    ]
+
+
+def _maze(size: int, rng: random.Random) -> List[List[str]]:
+    """Perfect maze (exactly one path between any two cells) on a size x size
+    grid, via an iterative randomized DFS. Cells sit on odd coordinates."""
+    size = size if size % 2 else size + 1
+    rows = [["#"] * size for _ in range(size)]
+
+    start = (1, size - 2)
+    rows[start[1]][start[0]] = "."
+    stack = [start]
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + dx, y + dy, dx, dy)
+            for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < x + dx < size - 1 and 0 < y + dy < size - 1 and rows[y + dy][x + dx] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+
+        nx, ny, dx, dy = rng.choice(options)
+        rows[y + dy // 2][x + dx // 2] = "."
+        rows[ny][nx] = "."
+        stack.append((nx, ny))
+
+    return rows
+
+
+def day_1(size: int, seed: int = 0) -> str:
+    """`size` pairs of location IDs. IDs are drawn from a shared pool so the
+    similarity score in part 2 has plenty of repeats."""
+    rng = random.Random(seed)
+    pool = [rng.randint(10000, 99999) for _ in range(max(size // 2, 1))]
+    return "\n".join(
+        f"{rng.choice(pool)}   {rng.choice(pool)}"
+        for _ in range(size)
+    )
+
+
+def day_2(size: int, seed: int = 0) -> str:
+    """`size` reports of 5-8 levels, mostly monotone with the odd bad level"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        sign = rng.choice((-1, 1))
+        level = rng.randint(20, 80)
+        levels = [level]
+        for _ in range(rng.randint(4, 7)):
+            step = rng.randint(1, 3) if rng.random() < 0.9 else rng.randint(-3, 5)
+            level += sign * step
+            levels.append(level)
+        lines.append(" ".join(map(str, levels)))
+
+    return "\n".join(lines)
+
+
+def day_3(size: int, seed: int = 0) -> str:
+    """About `size` characters of corrupted memory, with valid and
+    broken `mul(a,b)` instructions and the odd `do()`/`don't()`"""
+    rng = random.Random(seed)
+    noise = string.ascii_letters + string.digits + "!@#$%^&*()[]{}<>,;:'+-_ "
+    broken = ("mul(", "mul[{a},{b}]", "mul({a},{b}", "mul ( {a},{b})", "do_not_mul({a},{b})", "mul({a}, {b})")
+
+    parts, length = [], 0
+    while length < size:
+        roll = rng.random()
+        a, b = rng.randint(1, 999), rng.randint(1, 999)
+        if roll < 0.35:
+            part = f"mul({a},{b})"
+        elif roll < 0.45:
+            part = rng.choice(broken).format(a=a, b=b)
+        elif roll < 0.50:
+            part = rng.choice(("do()", "don't()"))
+        else:
+            part = "".join(rng.choices(noise, k=rng.randint(1, 12)))
+        parts.append(part)
+        length += len(part)
+
+    return "".join(parts)
+
+
+def day_4(size: int, seed: int = 0) -> str:
+    """size x size letter grid of X, M, A and S"""
+    rng = random.Random(seed)
+    return _grid([rng.choices("XMAS", k=size) for _ in range(size)])
+
+
+def day_5(size: int, seed: int = 0, pages: int = 49) -> str:
+    """A total order over `pages` page numbers (every pair gets a rule, like the
+    real input) followed by `size` updates, about half of them out of order"""
+    if not 1 <= pages <= 90:
+        raise ValueError(f"pages must be between 1 and 90 (two digit page numbers), not {pages}")
+
+    rng = random.Random(seed)
+    order = rng.sample(range(10, 100), k=pages)
+    # updates have an odd number of pages, so there's a middle one
+    longest = pages if pages % 2 else pages - 1
+
+    rules = [
+        f"{order[i]}|{order[j]}"
+        for i in range(len(order))
+        for j in range(i + 1, len(order))
+    ]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(size):
+        update = rng.sample(order, k=min(rng.randrange(5, 24, 2), longest))
+        if rng.random() < 0.5:
+            update.sort(key=order.index)
+        updates.append(",".join(map(str, update)))
+
+    return "\n".join(rules) + "\n\n" + "\n".join(updates)
+
+
+def _guard_leaves(rows: List[List[str]], x: int, y: int) -> bool:
+    """Walk the guard from (x, y) facing up, True if it leaves the map"""
+    size_y, size_x = len(rows), len(rows[0])
+    dx, dy = 0, -1
+    seen = set()
+    while True:
+        if (x, y, dx, dy) in seen:
+            return False
+        seen.add((x, y, dx, dy))
+
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < size_x and 0 <= ny < size_y):
+            return True
+        if rows[ny][nx] == "#":
+            dx, dy = -dy, dx
+        else:
+            x, y = nx, ny
+
+
+def day_6(size: int, seed: int = 0, density: float = 0.015, attempts: int = 1000) -> str:
+    """size x size lab with scattered obstructions and a guard facing up.
+    Re-rolls the guard's start (up to `attempts` times) until the patrol
+    actually leaves the map."""
+    rng = random.Random(seed)
+    rows = [
+        ["#" if rng.random() < density else "." for _ in range(size)]
+        for _ in range(size)
+    ]
+
+    for _ in range(attempts):
+        x, y = rng.randrange(size), rng.randrange(size)
+        if rows[y][x] == "." and _guard_leaves(rows, x, y):
+            rows[y][x] = "^"
+            return _grid(rows)
+
+    raise ValueError(
+        f"no start the guard leaves the {size}x{size} lab from in {attempts} attempts, "
+        f"try a lower density than {density}"
+    )
+
+
+def day_7(size: int, seed: int = 0) -> str:
+    """`size` calibration equations of 2-10 operands, about half of them
+    solvable with +, * and ||"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        operands = [rng.randint(1, 999) for _ in range(rng.randint(2, 10))]
+        target = operands[0]
+        for v in operands[1:]:
+            match rng.choice("+*|"):
+                case "+": target += v
+                case "*": target *= v
+                case "|": target = int(f"{target}{v}")
+
+        if rng.random() < 0.5:
+            target += rng.randint(1, 100)
+        lines.append(f"{target}: {' '.join(map(str, operands))}")
+
+    return "\n".join(lines)
+
+
+def day_8(size: int, seed: int = 0) -> str:
+    """size x size map with a handful of antennas per frequency"""
+    rng = random.Random(seed)
+    rows = [["."] * size for _ in range(size)]
+    frequencies = string.digits + string.ascii_letters
+    for _ in range(max(size * size // 50, 1)):
+        rows[rng.randrange(size)][rng.randrange(size)] = rng.choice(frequencies)
+
+    return _grid(rows)
+
+
+def day_9(size: int, seed: int = 0) -> str:
+    """Disk map of `size` digits (rounded up to odd, so it ends on a file)"""
+    rng = random.Random(seed)
+    size = size if size % 2 else size + 1
+    return "".join(
+        str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9))
+        for i in range(size)
+    )
+
+
+def day_10(size: int, seed: int = 0) -> str:
+    """size x size topographic map: random heights with 0-9 hiking trails
+    walked into it, so there are trailheads to score"""
+    rng = random.Random(seed)
+    rows = [[str(rng.randint(0, 9)) for _ in range(size)] for _ in range(size)]
+
+    for _ in range(max(size * size // 40, 1)):
+        x, y = rng.randrange(size), rng.randrange(size)
+        for height in range(10):
+            rows[y][x] = str(height)
+            dx, dy = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+            x, y = min(max(x + dx, 0), size - 1), min(max(y + dy, 0), size - 1)
+
+    return _grid(rows)
+
+
+def day_11(size: int, seed: int = 0) -> str:
+    """`size` stones"""
+    rng = random.Random(seed)
+    return " ".join(str(rng.randint(0, 999999)) for _ in range(size))
+
+
+def day_12(size: int, seed: int = 0) -> str:
+    """size x size garden of plant regions. Each cell either copies a neighbor
+    above/left (growing a region) or starts a new plant"""
+    rng = random.Random(seed)
+    rows = [[""] * size for _ in range(size)]
+    for y in range(size):
+        for x in range(size):
+            roll = rng.random()
+            if roll < 0.45 and x:
+                rows[y][x] = rows[y][x - 1]
+            elif roll < 0.9 and y:
+                rows[y][x] = rows[y - 1][x]
+            else:
+                rows[y][x] = rng.choice(string.ascii_uppercase)
+
+    return _grid(rows)
+
+
+def day_13(size: int, seed: int = 0) -> str:
+    """`size` claw machines, about half of them winnable"""
+    rng = random.Random(seed)
+    machines = []
+    for _ in range(size):
+        ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+        a, b = rng.randint(1, 100), rng.randint(1, 100)
+        px, py = a * ax + b * bx, a * ay + b * by
+        if rng.random() < 0.5:
+            px += rng.randint(1, 50)
+
+        machines.append(
+            f"Button A: X+{ax}, Y+{ay}\n"
+            f"Button B: X+{bx}, Y+{by}\n"
+            f"Prize: X={px}, Y={py}"
+        )
+
+    return "\n\n".join(machines)
+
+
+def day_14(size: int, seed: int = 0, width: int = 101, height: int = 103) -> str:
+    """`size` robots on the standard 101 x 103 floor"""
+    rng = random.Random(seed)
+    return "\n".join(
+        f"p={rng.randrange(width)},{rng.randrange(height)} "
+        f"v={rng.randint(-99, 99)},{rng.randint(-99, 99)}"
+        for _ in range(size)
+    )
+
+
+def day_15(size: int, seed: int = 0) -> str:
+    """size x size warehouse (walls, boxes, one robot) and size * 10 moves"""
+    rng = random.Random(seed)
+    rows = _walled(size)
+    for y in range(1, size - 1):
+        for x in range(1, size - 1):
+            roll = rng.random()
+            if roll < 0.05:
+                rows[y][x] = "#"
+            elif roll < 0.30:
+                rows[y][x] = "O"
+
+    rows[size // 2][size // 2] = "@"
+
+    moves = "".join(rng.choices("^>v<", k=size * 10))
+    return _grid(rows) + "\n\n" + "\n".join(moves[i:i + 1000] for i in range(0, len(moves), 1000))
+
+
+def day_16(size: int, seed: int = 0, loops: float = 0.05) -> str:
+    """size x size maze (rounded up to odd), with a fraction of the inner walls
+    knocked out so there's more than one best path. S bottom left, E top right."""
+    rng = random.Random(seed)
+    rows = _maze(size, rng)
+    size = len(rows)
+
+    for y in range(1, size - 1):
+        for x in range(1, size - 1):
+            if rows[y][x] == "#" and (x % 2) != (y % 2) and rng.random() < loops:
+                rows[y][x] = "."
+
+    rows[size - 2][1] = "S"
+    rows[1][size - 2] = "E"
+    return _grid(rows)
+
+
+def day_17(size: int, seed: int = 0) -> str:
+    """A program shaped like the real one (shift A by 3 bits per output) and an
+    A register that prints `size` values. The two `bxl` constants are picked
+    from the pairs where some A makes the program print itself, so part 2 has
+    an answer."""
+    rng = random.Random(seed)
+    a = rng.randrange(8 ** (size - 1), 8 ** size)
+    first, second = rng.choice(((1, 4), (3, 5), (5, 6)))
+    program = [2, 4, 1, first, 7, 5, 4, 6, 0, 3, 1, second, 5, 5, 3, 0]
+    return (
+        f"Register A: {a}\n"
+        f"Register B: 0\n"
+        f"Register C: 0\n"
+        f"\n"
+        f"Program: {','.join(map(str, program))}"
+    )
+
+
+def day_18(size: int, seed: int = 0, fraction: float = 0.7) -> str:
+    """Falling bytes for a size x size memory space, covering `fraction` of it.
+    Never drops on the start or exit."""
+    rng = random.Random(seed)
+    cells = [
+        (x, y)
+        for y in range(size)
+        for x in range(size)
+        if (x, y) not in ((0, 0), (size - 1, size - 1))
+    ]
+    return "\n".join(f"{x},{y}" for x, y in rng.sample(cells, k=int(len(cells) * fraction)))
+
+
+def day_19(size: int, seed: int = 0, patterns: int = 400) -> str:
+    """`patterns` towels and `size` designs, about half of them possible"""
+    rng = random.Random(seed)
+    towels = sorted({"".join(rng.choices("wubrg", k=rng.randint(1, 8))) for _ in range(patterns)} - set("wubrg"))
+    # all singles but one, so not every design is possible
+    towels += list("wbrg")
+
+    designs = []
+    for _ in range(size):
+        if rng.random() < 0.5:
+            design = ""
+            while len(design) < rng.randint(20, 60):
+                design += rng.choice(towels)
+        else:
+            design = "".join(rng.choices("wubrg", k=rng.randint(20, 60)))
+        designs.append(design)
+
+    return ", ".join(towels) + "\n\n" + "\n".join(designs)
+
+
+def day_20(size: int, seed: int = 0) -> str:
+    """A single-lane racetrack through a size x size grid: the path from S to E
+    through a perfect maze, with everything else walled off"""
+    rng = random.Random(seed)
+    maze = _maze(size, rng)
+    size = len(maze)
+
+    start, end = (1, size - 2), (size - 2, 1)
+
+    # DFS from start to end through the maze, keeping the parent pointers
+    parents = {start: None}
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        if (x, y) == end:
+            break
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            n = (x + dx, y + dy)
+            if maze[n[1]][n[0]] == "." and n not in parents:
+                parents[n] = (x, y)
+                stack.append(n)
+
+    rows = [["#"] * size for _ in range(size)]
+    current = end
+    while current is not None:
+        rows[current[1]][current[0]] = "."
+        current = parents[current]
+
+    rows[start[1]][start[0]] = "S"
+    rows[end[1]][end[0]] = "E"
+    return _grid(rows)
+
+
+def day_21(size: int, seed: int = 0) -> str:
+    """`size` door codes"""
+    rng = random.Random(seed)
+    return "\n".join(f"{rng.randint(0, 999):03}A" for _ in range(size))
+
+
+def day_22(size: int, seed: int = 0) -> str:
+    """`size` buyers' initial secret numbers"""
+    rng = random.Random(seed)
+    return "\n".join(str(rng.randint(1, 16777215)) for _ in range(size))
+
+
+def _name(i: int, width: int) -> str:
+    letters = []
+    for _ in range(width):
+        i, r = divmod(i, 26)
+        letters.append(string.ascii_lowercase[r])
+    return "".join(reversed(letters))
+
+
+def day_23(size: int, seed: int = 0, degree: int = 13) -> str:
+    """LAN of `size` computers with about `degree` connections each, plus one
+    planted clique of `degree` computers for part 2 to find. Names are two
+    letters like the real input, and grow longer once two letters run out."""
+    rng = random.Random(seed)
+    width = max(2, math.ceil(math.log(max(size, 2), 26)))
+    names = [_name(i, width) for i in rng.sample(range(26 ** width), k=size)]
+
+    edges: Set[Tuple[int, int]] = set()
+
+    clique = rng.sample(range(size), k=min(degree, size))
+    for i, a in enumerate(clique):
+        for b in clique[i + 1:]:
+            edges.add((min(a, b), max(a, b)))
+
+    target = min(size * (degree // 2), size * (size - 1) // 2)
+    while len(edges) < target and size > 1:
+        a, b = rng.sample(range(size), k=2)
+        edges.add((min(a, b), max(a, b)))
+
+    lines = [
+        f"{names[a]}-{names[b]}" if rng.random() < 0.5 else f"{names[b]}-{names[a]}"
+        for a, b in edges
+    ]
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def day_24(size: int, seed: int = 0) -> str:
+    """A `size`-bit ripple-carry adder, wired the same way as the real input,
+    with random x/y values and random internal wire names. Part 2's validator
+    only understands the real 45-bit width."""
+    rng = random.Random(seed)
+    width = max(2, len(str(size)))
+    used: Set[str] = set()
+
+    def wire() -> str:
+        while True:
+            name = "".join(rng.choices("abcdefghijklmnopqrstuvw", k=3))
+            if name not in used:
+                used.add(name)
+                return name
+
+    def bit(prefix: str, i: int) -> str:
+        return f"{prefix}{i:0{width}}"
+
+    inputs = [f"{bit('x', i)}: {rng.randint(0, 1)}" for i in range(size)]
+    inputs += [f"{bit('y', i)}: {rng.randint(0, 1)}" for i in range(size)]
+
+    gates = []
+    carry = None
+    for i in range(size):
+        x, y, z = bit("x", i), bit("y", i), bit("z", i)
+        if carry is None:
+            carry = wire()
+            gates.append(f"{x} XOR {y} -> {z}")
+            gates.append(f"{x} AND {y} -> {carry}")
+            continue
+
+        half_sum, half_carry, both = wire(), wire(), wire()
+        next_carry = bit("z", size) if i == size - 1 else wire()
+        gates += [
+            f"{x} XOR {y} -> {half_sum}",
+            f"{x} AND {y} -> {half_carry}",
+            f"{half_sum} XOR {carry} -> {z}",
+            f"{half_sum} AND {carry} -> {both}",
+            f"{half_carry} OR {both} -> {next_carry}",
+        ]
+        carry = next_carry
+
+    rng.shuffle(gates)
+    return "\n".join(inputs) + "\n\n" + "\n".join(gates)
+
+
+def day_25(size: int, seed: int = 0) -> str:
+    """`size` lock and key schematics (7 x 5)"""
+    rng = random.Random(seed)
+    schematics = []
+    for _ in range(size):
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        rows = [
+            ["#" if r >= 5 - h else "." for h in heights]
+            for r in range(5)
+        ]
+        if rng.random() < 0.5:
+            # lock: filled top row, pins hang down
+            rows = [["#"] * 5] + rows[::-1] + [["."] * 5]
+        else:
+            # key: filled bottom row, teeth point up
+            rows = [["."] * 5] + rows + [["#"] * 5]
+        schematics.append(_grid(rows))
+
+    return "\n\n".join(schematics)
+
+
+GENERATORS: Dict[int, Callable[..., str]] = {
+    day: globals()[f"day_{day}"]
+    for day in range(1, 26)
+}
+
+# Solvers whose `main` needs more than the input, given the module and size
+KWARGS: Dict[Tuple[int, int], Callable[[Any, int], Dict[str, Any]]] = {
+    (14, 1): lambda m, size: dict(shape=m.Coord(x=101, y=103)),
+    (14, 2): lambda m, size: dict(shape=m.Coord(x=101, y=103)),
+    (18, 1): lambda m, size: dict(stop=m.Coord(size - 1, size - 1), n_bytes=size * size // 5),
+    (18, 2): lambda m, size: dict(stop=m.Coord(size - 1, size - 1), n_bytes=size * size // 5),
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, seed=seed)
+
+
+def scale(
+    day: int,
+    part: int,
+    sizes: List[int],
+    seed: int = 0,
+    repeat: int = 1,
+    warmup: int = 0,
+    budget: Optional[float] = None,
+) -> List[Tuple[int, int, Timing]]:
+    """Time `day_N/part_M.main` on generated inputs of increasing size.
+    Returns (size, input bytes, timing) per size."""
+    module = importlib.import_module(f"day_{day}.part_{part}")
+    kwargs = KWARGS.get((day, part), lambda m, size: {})
+
+    results = []
+    cwd = os.getcwd()
+    os.chdir(os.path.join(ROOT, f"day_{day}"))
+    try:
+        for size in sizes:
+            data = generate(day, size, seed=seed)
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                with benchmarking(repeat=repeat, warmup=warmup, budget=budget, quiet=True):
+                    module.main(data, **kwargs(module, size))
+            results.append((size, len(data), module.main.last_timing))
+    finally:
+        os.chdir(cwd)
+
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int, nargs="?", help="generate one input of this size to stdout")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--part", type=int, default=1, choices=(1, 2))
+    parser.add_argument("--scale", type=int, nargs="+", default=None, help="time the solver at each of these sizes")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+
+    if args.scale:
+        print(f"day_{args.day}/part_{args.part}")
+        print(f"{'size':>10}  {'bytes':>12}  {'median ms':>12}  {'min ms':>12}")
+        for size, n_bytes, timing in scale(args.day, args.part, args.scale, args.seed, args.repeat, budget=args.budget):
+            print(f"{size:>10}  {n_bytes:>12}  {timing.median / 1e6:>12.3f}  {timing.min / 1e6:>12.3f}")
+    elif args.size is not None:
+        print(generate(args.day, args.size, seed=args.seed))
+    else:
+        raise SystemExit("Give a size, or --scale with a list of sizes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Shared grid for the map/maze days.
+
+Cells live in one flat `bytearray`, addressed by integer index instead of
+`Coord` objects. The grid is padded with `pad` rings of `OUTSIDE` cells, so
+walking off the edge lands on a sentinel instead of needing a bounds check
+(as long as a single move never goes further than `pad` cells).
+
+    grid = Grid.parse(data)
+    start = grid.find("S")
+    for d in grid.directions:
+        if grid[start + d] == ord("."):
+            ...
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+
+OUTSIDE = 0
+
+Cell = Union[int, str]
+
+
+def _byte(value: Cell) -> int:
+    return ord(value) if isinstance(value, str) else value
+
+
+class Grid:
+    def __init__(self, rows: Iterable[Union[str, bytes]], pad: int = 1):
+        rows = [row.encode() if isinstance(row, str) else bytes(row) for row in rows]
+
+        self.height = len(rows)
+        self.width = len(rows[0]) if rows else 0
+        self.pad = pad
+        self.stride = self.width + 2 * pad
+        self.cells = bytearray(self.stride * (self.height + 2 * pad))
+
+        for y, row in enumerate(rows):
+            if len(row) != self.width:
+                # would grow (or shrink) the bytearray, shifting every cell after it
+                raise ValueError(f"row {y} is {len(row)} cells wide, expected {self.width}")
+            start = self.index(0, y)
+            self.cells[start:start + self.width] = row
+
+        # offsets, clockwise starting from up (increasing y goes down)
+        self.up, self.right, self.down, self.left = -self.stride, 1, self.stride, -1
+        self.directions: Tuple[int, int, int, int] = (self.up, self.right, self.down, self.left)
+        self.diagonals: Tuple[int, int, int, int] = (
+            self.up + self.left,
+            self.up + self.right,
+            self.down + self.right,
+            self.down + self.left,
+        )
+        self.neighbors: Tuple[int, ...] = self.directions + self.diagonals
+
+        self.right_of: Dict[int, int] = {d: self.directions[(i + 1) % 4] for i, d in enumerate(self.directions)}
+        self.left_of: Dict[int, int] = {d: self.directions[(i - 1) % 4] for i, d in enumerate(self.directions)}
+
+    @classmethod
+    def parse(cls, data: str, pad: int = 1) -> Grid:
+        return cls(data.splitlines(), pad=pad)
+
+    @classmethod
+    def blank(cls, width: int, height: int, fill: Cell = ".", pad: int = 1) -> Grid:
+        return cls([bytes([_byte(fill)]) * width] * height, pad=pad)
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.pad) * self.stride + x + self.pad
+
+    def xy(self, i: int) -> Tuple[int, int]:
+        y, x = divmod(i, self.stride)
+        return x - self.pad, y - self.pad
+
+    def inside(self, i: int) -> bool:
+        return self.cells[i] != OUTSIDE
+
+    def __getitem__(self, i: int) -> int:
+        return self.cells[i]
+
+    def __setitem__(self, i: int, value: Cell):
+        self.cells[i] = _byte(value)
+
+    def __iter__(self) -> Iterator[int]:
+        # reading order, only the cells within the map
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def swap(self, this: int, that: int):
+        self.cells[this], self.cells[that] = self.cells[that], self.cells[this]
+
+    def find(self, value: Cell) -> int:
+        """Index of the first cell (reading order) holding value, -1 if none"""
+        return self.cells.find(_byte(value))
+
+    def find_all(self, value: Cell) -> List[int]:
+        """Indices of every cell holding value, in reading order"""
+        value = _byte(value)
+        found = []
+        i = self.cells.find(value)
+        while i != -1:
+            found.append(i)
+            i = self.cells.find(value, i + 1)
+        return found
+
+    def count(self, value: Cell) -> int:
+        return self.cells.count(_byte(value))
+
+    def copy(self) -> Grid:
+        other = object.__new__(Grid)
+        other.__dict__.update(self.__dict__)
+        other.cells = self.cells.copy()
+        return other
+
+    def rows(self) -> List[str]:
+        return [
+            self.cells[self.index(0, y):self.index(self.width, y)].decode()
+            for y in range(self.height)
+        ]
+
+    def print(self):
+        for row in self.rows():
+            print(row)
@@ -0,0 +1,137 @@
+"""Import cost of every solver, `python -X importtime` style.
+
+Each solver is imported in a fresh interpreter, so the numbers are cold-start
+costs: everything the solver pulls in (`utils`, the stdlib, NumPy, ...) counts,
+the interpreter's own startup doesn't.
+
+    python importtime.py              # every solver
+    python importtime.py 14 --top 10  # the heaviest packages behind day 14
+    python importtime.py --max-ms 50  # exit non-zero if any solver imports slower
+"""
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass, field
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from run import ROOT, discover
+
+
+# printed to stderr right before the solver import, to skip the startup modules
+MARKER = "--- importtime ---"
+
+
+@dataclass
+class ImportCost:
+    module: str
+    total_us: int = 0
+    modules: int = 0
+    wall_ms: float = 0.0
+    # self time per top-level package, heaviest first
+    packages: List[Tuple[str, int]] = field(default_factory=list)
+
+
+def _importtime(module: str) -> Tuple[str, float]:
+    """stderr of `-X importtime` for importing module, and the wall time of the process in ms"""
+    code = f"import sys; sys.stderr.write({MARKER!r} + '\\n'); import {module}"
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return proc.stderr, (time.perf_counter() - start) * 1000
+
+
+def _startup_ms() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def parse(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every import after the marker"""
+    _, _, lines = stderr.partition(MARKER)
+
+    found = []
+    for line in lines.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        found.append((name.strip(), int(own), int(cumulative)))
+    return found
+
+
+def import_cost(module: str, repeat: int = 3) -> ImportCost:
+    """Cold import cost of a module, best of `repeat` fresh interpreters"""
+    startup = min(_startup_ms() for _ in range(repeat))
+
+    best = None
+    for _ in range(repeat):
+        stderr, wall = _importtime(module)
+        imports = parse(stderr)
+        total = sum(own for _, own, _ in imports)
+
+        if best is None or total < best.total_us:
+            packages: Dict[str, int] = defaultdict(int)
+            for name, own, _ in imports:
+                packages[name.split(".")[0]] += own
+
+            best = ImportCost(
+                module=module,
+                total_us=total,
+                modules=len(imports),
+                wall_ms=max(wall - startup, 0.0),
+                packages=sorted(packages.items(), key=lambda p: -p[1]),
+            )
+
+    return best
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", nargs="*", type=int, help="only these days (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per solver, the best is kept")
+    parser.add_argument("--top", type=int, default=3, help="heaviest packages to list per solver")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if any solver takes longer to import")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    modules = sorted({(t.day, t.part): t.module for t in discover(args.days)}.items())
+
+    costs = []
+    print(f"{'solver':<16}{'import ms':>10}{'wall ms':>10}{'modules':>9}  heaviest")
+    for _, module in modules:
+        cost = import_cost(module, repeat=args.repeat)
+        costs.append(cost)
+
+        heaviest = ", ".join(f"{name} {own / 1000:.1f}" for name, own in cost.packages[:args.top])
+        print(f"{module:<16}{cost.total_us / 1000:>10.1f}{cost.wall_ms:>10.1f}{cost.modules:>9}  {heaviest}", flush=True)
+
+    totals = [c.total_us / 1000 for c in costs]
+    if totals:
+        print(f"\n{len(costs)} solvers, median {statistics.median(totals):.1f}ms, max {max(totals):.1f}ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([c.__dict__ for c in costs], f, indent=2)
+
+    if args.max_ms is not None:
+        slow = [c for c in costs if c.total_us / 1000 > args.max_ms]
+        for c in slow:
+            print(f"{c.module} imports in {c.total_us / 1000:.1f}ms, over the {args.max_ms}ms limit")
+        return 1 if slow else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+"""Deferred imports for heavy dependencies.
+
+    np = lazy_import("numpy")
+
+binds a module object straight away, but the import itself only runs on the
+first attribute access (`np.zeros(...)`). A solver that never reaches its
+NumPy code path never pays for importing NumPy. Already imported modules are
+returned as they are.
+
+`time_it` calls `load` on the solver before timing it, so the deferred import
+isn't counted as part of the first call.
+"""
+from __future__ import annotations
+
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Callable, Dict
+
+
+# every module handed out still unloaded, by id, until it's loaded
+_deferred: Dict[int, ModuleType] = {}
+
+
+def lazy_import(name: str) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    _deferred[id(module)] = module
+    return module
+
+
+def load(f: Callable):
+    """Run the deferred imports of the module f is defined in, now"""
+    for value in list(getattr(f, "__globals__", {}).values()):
+        module = _deferred.pop(id(value), None) if isinstance(value, ModuleType) else None
+        if module is not None:
+            getattr(module, "__name__")  # any attribute access runs the import
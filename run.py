@@ -0,0 +1,288 @@
+"""Run every `day_N/part_M.py` solver from a single process pool.
+
+    python run.py                  # every day, practice + real inputs
+    python run.py 6 9 --repeat 20  # benchmark days 6 and 9
+    python run.py --json report.json
+    python run.py --save-baseline  # record timings for this git revision
+    python run.py --compare        # flag anything slower than the stored baseline
+    python run.py --cache          # reuse answers for unchanged solvers + inputs
+    python run.py 14 --memory      # also trace peak/net memory per solver
+    python run.py 16 --counters    # and how much work the search solvers do
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import dataclass, asdict
+import hashlib
+import importlib
+import json
+import os
+import re
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import baseline
+import cache
+from utils import benchmarking, read_input
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOLVER = re.compile(r'^day_(\d+)/part_(\d+)\.py$')
+
+# Input file suffixes a solver runs against, same as their `__main__` blocks.
+# `""` is the real input (`part_M.txt`), anything else is `part_M<suffix>.txt`.
+DEFAULT_INPUTS = ("_practice", "")
+INPUTS: Dict[Tuple[int, int], Tuple[str, ...]] = {
+    (14, 2): ("",),
+    (17, 2): ("",),
+    (21, 2): ("",),
+    (24, 2): ("_fixed",),
+}
+
+# Solvers whose `main` takes more than just the input. Called with the imported
+# module, so the kwargs can be built from the solver's own types.
+KWARGS: Dict[Tuple[int, int, str], Callable[[Any], Dict[str, Any]]] = {
+    (14, 1, "_practice"): lambda m: dict(shape=m.Coord(x=11, y=7)),
+    (14, 1, ""): lambda m: dict(shape=m.Coord(x=101, y=103)),
+    (14, 2, ""): lambda m: dict(shape=m.Coord(x=101, y=103)),
+    (18, 1, "_practice"): lambda m: dict(stop=m.Coord(6, 6), n_bytes=12),
+    (18, 1, ""): lambda m: dict(stop=m.Coord(70, 70), n_bytes=1024),
+    (18, 2, "_practice"): lambda m: dict(stop=m.Coord(6, 6), n_bytes=12),
+    (18, 2, ""): lambda m: dict(stop=m.Coord(70, 70), n_bytes=1024),
+}
+
+
+@dataclass
+class Task:
+    day: int
+    part: int
+    suffix: str
+
+    @property
+    def module(self) -> str:
+        return f"day_{self.day}.part_{self.part}"
+
+    @property
+    def input_file(self) -> str:
+        return f"part_{self.part}{self.suffix}.txt"
+
+    @property
+    def label(self) -> str:
+        return f"day_{self.day}/{self.input_file}"
+
+
+@dataclass
+class Result:
+    day: int
+    part: int
+    input_file: str
+    input_sha256: Optional[str] = None
+    answer: Optional[str] = None
+    timing: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def discover(days: Optional[List[int]] = None) -> List[Task]:
+    """Find every `day_N/part_M.py` and the inputs to run it against"""
+    tasks = []
+    for name in os.listdir(ROOT):
+        if not name.startswith("day_"):
+            continue
+
+        for part in sorted(os.listdir(os.path.join(ROOT, name))):
+            m = SOLVER.match(f"{name}/{part}")
+            if not m:
+                continue
+
+            day, part = int(m.group(1)), int(m.group(2))
+            if days and day not in days:
+                continue
+
+            for suffix in INPUTS.get((day, part), DEFAULT_INPUTS):
+                task = Task(day, part, suffix)
+                if os.path.exists(os.path.join(ROOT, f"day_{day}", task.input_file)):
+                    tasks.append(task)
+
+    return sorted(tasks, key=lambda t: (t.day, t.part, t.suffix != "_practice", t.suffix))
+
+
+def execute(
+    task: Task,
+    repeat: int = 1,
+    warmup: int = 0,
+    budget: Optional[float] = None,
+    cache_dir: Optional[str] = None,
+    memory: bool = False,
+    counters: bool = False,
+) -> Result:
+    """Run a single solver against a single input. Runs inside the worker process."""
+    result = Result(task.day, task.part, task.input_file)
+
+    # solvers expect to be run from within their own day directory
+    os.chdir(os.path.join(ROOT, f"day_{task.day}"))
+    try:
+        module = importlib.import_module(task.module)
+        kwargs = KWARGS.get((task.day, task.part, task.suffix), lambda _: {})(module)
+        data = read_input(task.input_file)
+        result.input_sha256 = hashlib.sha256(data.encode()).hexdigest()
+
+        # drop the solvers' debug printing, only the answer is kept
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            with benchmarking(repeat=repeat, warmup=warmup, budget=budget, quiet=True, memory=memory, counters=counters):
+                with cache.caching(cache_dir) if cache_dir else nullcontext():
+                    answer = module.main(data, **kwargs)
+
+        result.answer = str(answer)
+        result.timing = module.main.last_timing.as_dict()
+    except Exception:
+        result.error = traceback.format_exc(limit=-3)
+
+    return result
+
+
+def run(
+    tasks: List[Task],
+    workers: Optional[int] = None,
+    repeat: int = 1,
+    warmup: int = 0,
+    budget: Optional[float] = None,
+    cache_dir: Optional[str] = None,
+    memory: bool = False,
+    counters: bool = False,
+    on_result: Callable[[Task, Result], None] = lambda task, result: None,
+) -> List[Result]:
+    results: Dict[int, Result] = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(execute, task, repeat, warmup, budget, cache_dir, memory, counters): i
+            for i, task in enumerate(tasks)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            on_result(tasks[i], results[i])
+
+    return [results[i] for i in range(len(tasks))]
+
+
+def report(results: List[Result]) -> str:
+    rows = [("solver", "input", "answer", "n", "median ms", "p95 ms", "peak MiB")]
+    for r in results:
+        t = r.timing or {}
+        m = t.get("memory")
+        rows.append((
+            f"day_{r.day}/part_{r.part}",
+            r.input_file,
+            r.answer if r.ok else "ERROR",
+            "cached" if t.get("cached") else str(t.get("n", "")),
+            f"{t['median'] / 1e6:.3f}" if t else "",
+            f"{t['p95'] / 1e6:.3f}" if t else "",
+            f"{m['peak'] / 2**20:.3f}" if m else "",
+        ))
+
+    widths = [min(max(len(row[i]) for row in rows), 40) for i in range(len(rows[0]))]
+    lines = [
+        "  ".join(value[:40].ljust(w) for value, w in zip(row, widths))
+        for row in rows
+    ]
+
+    counted = [r for r in results if r.timing and r.timing.get("counters")]
+    if counted:
+        lines.append("\ncounters (last timed call)")
+    for r in counted:
+        values = " ".join(f"{k}={v}" for k, v in sorted(r.timing["counters"].items()))
+        lines.append(f"day_{r.day}/part_{r.part} {r.input_file}: {values}")
+
+    for r in results:
+        if not r.ok:
+            lines.append(f"\nday_{r.day}/part_{r.part} {r.input_file}:\n{r.error}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", nargs="*", type=int, help="only run these days (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="pool size (default: core count)")
+    parser.add_argument("--repeat", type=int, default=1, help="timed calls per solver/input")
+    parser.add_argument("--warmup", type=int, default=0, help="untimed calls before timing")
+    parser.add_argument("--budget", type=float, default=None, help="max seconds of timed calls per solver/input")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    parser.add_argument("--baseline", default=baseline.DEFAULT_PATH, help="baseline store (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="record this run's timings in the baseline store")
+    parser.add_argument("--compare", action="store_true", help="flag solvers slower than their stored baseline")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="allowed slowdown vs baseline for every solver, as a fraction "
+                             f"(default: {baseline.DEFAULT_THRESHOLD}, tighter for some, see baseline.THRESHOLDS)")
+    parser.add_argument("--min-ms", type=float, default=baseline.MIN_DIFFERENCE["time"],
+                        help="never flag a slowdown smaller than this many ms (default: %(default)s)")
+    parser.add_argument("--memory", action="store_true",
+                        help="trace peak/net allocations with tracemalloc (one extra, untimed call)")
+    parser.add_argument("--counters", action="store_true",
+                        help="collect the search solvers' work counters (nodes expanded, pruned, ...)")
+    parser.add_argument("--cache", nargs="?", const=cache.DEFAULT_PATH, default=None, metavar="DIR",
+                        help="serve unchanged solver + input pairs from a result cache (default dir: %(const)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    tasks = discover(args.days)
+
+    start = time.perf_counter()
+    results = run(
+        tasks,
+        workers=args.workers,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        budget=args.budget,
+        cache_dir=args.cache,
+        memory=args.memory,
+        counters=args.counters,
+        on_result=lambda task, result: print(f"{'ok ' if result.ok else 'ERR'} {task.label}", flush=True),
+    )
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(report(results))
+    print(f"\n{len(results)} runs in {elapsed:.2f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+    regressed = False
+    if args.compare or args.save_baseline:
+        store = baseline.load(args.baseline)
+        revision = baseline.git_revision()
+
+        if args.compare:
+            comparisons = baseline.compare(
+                store, results,
+                threshold=args.threshold,
+                min_difference={**baseline.MIN_DIFFERENCE, "time": args.min_ms},
+            )
+            print(f"\nCompared {len(comparisons)} runs against {args.baseline}")
+            for c in comparisons:
+                print(c)
+            regressed = any(c.regressed for c in comparisons)
+
+        if args.save_baseline:
+            for r in results:
+                # a cache hit timed the lookup, not the solver
+                if r.ok and not r.timing.get("cached"):
+                    baseline.record(store, r.day, r.part, r.input_sha256, revision, r.timing)
+            baseline.save(store, args.baseline)
+            print(f"\nSaved baseline for {revision} to {args.baseline}")
+
+    return 0 if all(r.ok for r in results) and not regressed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,25 +1,388 @@
-import datetime
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+import math
+import mmap
 import os
+import time
+from typing import Any, Callable, Dict, Generator, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import cache
+from counters import counting
+from lazy import lazy_import, load
+
+# a single-sample `time_it` print never needs it
+statistics = lazy_import("statistics")
+# only for `--memory` runs
+tracemalloc = lazy_import("tracemalloc")
 
 
 def input_path(fp: str) -> str:
     return os.path.basename(fp).replace(".py", ".txt")
 
 
-def read_input(fp):
-    with open(fp) as f:
-        content = f.read()
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+def read_input(fp, mode: str = "text") -> Union[str, Buffer]:
+    """Read a puzzle input.
+
+    - `text`:  the whole file as a `str` (default)
+    - `bytes`: the whole file as `bytes`, no decoding
+    - `mmap`:  a read-only `mmap` of the file. Nothing is read up front, pages are
+               loaded as they're touched. Slice it through `memoryview` (or
+               `iter_lines`) to avoid copies.
+    """
+    match mode:
+        case "text":
+            with open(fp) as f:
+                content = f.read()
+        case "bytes":
+            with open(fp, "rb") as f:
+                content = f.read()
+        case "mmap":
+            with open(fp, "rb") as f:
+                try:
+                    # the mapping stays valid after the file is closed
+                    content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # empty files can't be mapped
+                    content = b""
+        case _:
+            raise ValueError(f"Unknown read mode {mode!r}")
 
     return content
 
 
-def time_it(f):
-    def inner(*args, **kwargs):
-        start = datetime.datetime.now()
+def iter_lines(buffer: Buffer) -> Generator[memoryview, None, None]:
+    """Zero-copy line iterator over a bytes-like buffer (`bytes`, `mmap`, ...).
+    Yields `memoryview` slices without the line terminator, like `splitlines`
+    but only splitting on `\n` (a trailing `\r` is dropped too)."""
+    view = memoryview(buffer)
+    size = len(buffer)
+
+    start = 0
+    while start < size:
+        end = buffer.find(b"\n", start)
+        if end == -1:
+            end = size
+
+        stop = end
+        if stop > start and view[stop - 1] == 13:  # \r
+            stop -= 1
+
+        yield view[start:stop]
+        start = end + 1
+
+
+# The records below are NamedTuples rather than dataclasses: every solver imports
+# this module, and `dataclasses` pulls in `inspect` at import time.
+
+class Benchmark(NamedTuple):
+    """How `time_it` should sample a call.
+
+    `repeat` is the max number of timed calls, `budget` is the max number of
+    seconds to spend on them (whichever runs out first, at least one call is
+    always timed). `warmup` calls are made first and thrown away. With `memory`,
+    one more call is made under `tracemalloc` (untimed, tracing is slow). With
+    `counters`, the solvers' work counters are collected for each timed call.
+    """
+    repeat: int = 1
+    warmup: int = 0
+    budget: Optional[float] = None
+    quiet: bool = False
+    memory: bool = False
+    counters: bool = False
+
+
+class MemoryUsage(NamedTuple):
+    """What a single traced call allocated. Sizes are in bytes.
+
+    `peak` is the most memory held at once during the call, `net` what was still
+    held once it returned (the result included), `top` the lines responsible
+    for most of `net` as `("file:line", bytes)`.
+    """
+    peak: int
+    net: int
+    top: List[Tuple[str, int]]
+
+    def __str__(self):
+        mib = lambda b: round(b / 2**20, 3)
+        return f"peak={mib(self.peak)}MiB net={mib(self.net)}MiB"
+
+
+class Timing(NamedTuple):
+    """Structured record of a `time_it`-decorated call. Samples are in ns.
+    A `cached` record timed the result cache lookup, not the function."""
+    name: str
+    samples: List[int]
+    warmup: int = 0
+    cached: bool = False
+    memory: Optional[MemoryUsage] = None
+    # work counters of the last timed call, see `counters`
+    counters: Optional[Dict[str, int]] = None
+
+    @property
+    def n(self) -> int:
+        return len(self.samples)
+
+    @property
+    def min(self) -> int:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> int:
+        # nearest-rank percentile, no interpolation
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+    @property
+    def stddev(self) -> float:
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **self._asdict(),
+            "memory": self.memory._asdict() if self.memory else None,
+            "n": self.n,
+            "min": self.min,
+            "median": self.median,
+            "p95": self.p95,
+            "stddev": self.stddev,
+        }
+
+    def __str__(self):
+        if self.cached:
+            return f"Cached, took {round(self.samples[0] / 1e6, 5)}ms"
+
+        if self.n == 1:
+            s = self.samples[0] / 1e9
+            line = f"Took {round(s, 5)}s, {round(s * 1000, 5)}ms"
+        else:
+            ms = lambda ns: round(ns / 1e6, 5)
+            line = (f"{self.name}: n={self.n} "
+                    f"min={ms(self.min)}ms median={ms(self.median)}ms "
+                    f"p95={ms(self.p95)}ms stddev={ms(self.stddev)}ms")
+
+        if self.memory:
+            line = f"{line}, {self.memory}"
+        if self.counters:
+            line = f"{line}, " + " ".join(f"{k}={v}" for k, v in sorted(self.counters.items()))
+        return line
+
+
+def _benchmark_from_env() -> Optional[Benchmark]:
+    """`AOC_BENCHMARK=<repeat>[,<warmup>[,<budget>]]` turns on benchmarking
+    for every decorated `main`, without touching the solvers."""
+    raw = os.environ.get("AOC_BENCHMARK")
+    memory = os.environ.get("AOC_MEMORY", "0") != "0"
+    counters = os.environ.get("AOC_COUNTERS", "0") != "0"
+    if not raw:
+        return Benchmark(memory=memory, counters=counters) if memory or counters else None
+
+    parts = raw.split(",")
+    return Benchmark(
+        repeat=int(parts[0]),
+        warmup=int(parts[1]) if len(parts) > 1 else 1,
+        budget=float(parts[2]) if len(parts) > 2 else None,
+        memory=memory,
+        counters=counters,
+    )
+
+
+_benchmark: Optional[Benchmark] = _benchmark_from_env()
+
+
+@contextmanager
+def benchmarking(
+    repeat: int = 10,
+    warmup: int = 1,
+    budget: Optional[float] = None,
+    quiet: bool = False,
+    memory: bool = False,
+    counters: bool = False,
+) -> Generator[Benchmark, None, None]:
+    """Switch every `time_it`-decorated function into benchmark mode
+    for the duration of the block."""
+    global _benchmark
+
+    previous = _benchmark
+    _benchmark = Benchmark(
+        repeat=repeat, warmup=warmup, budget=budget, quiet=quiet, memory=memory, counters=counters,
+    )
+    try:
+        yield _benchmark
+    finally:
+        _benchmark = previous
+
+
+def _location(frame: "tracemalloc.Frame") -> str:
+    root = os.path.dirname(os.path.abspath(__file__))
+    filename = frame.filename
+    if filename.startswith(root):
+        filename = os.path.relpath(filename, root)
+    return f"{filename}:{frame.lineno}"
+
+
+def trace_memory(f, args, kwargs, top: int = 10) -> Tuple[Any, MemoryUsage]:
+    """Call f once under `tracemalloc`, returning its result and what it allocated"""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    ignore = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    )
+    try:
+        before_snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
         result = f(*args, **kwargs)
-        end = datetime.datetime.now()
 
-        print(f"Took {round((end - start).total_seconds(), 5)}s, "
-              f"{round((end - start).total_seconds() * 1000, 5)}ms")
+        after, peak = tracemalloc.get_traced_memory()
+        after_snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    lines = [
+        (_location(stat.traceback[0]), stat.size_diff)
+        for stat in after_snapshot.compare_to(before_snapshot, "lineno")
+        if stat.size_diff > 0
+    ]
+    return result, MemoryUsage(peak=peak - before, net=after - before, top=lines[:top])
+
+
+def measure(
+    f, args, kwargs, benchmark: Benchmark, name: str = "", prepare: Optional[Callable] = None,
+) -> Tuple[Any, Timing]:
+    """Call f according to `benchmark`, returning the last result and its timing"""
+    # imports deferred with `lazy_import` aren't part of f's time
+    load(f)
+    # nor are the tables f caches across calls, so the first call times like the rest
+    if prepare is not None:
+        prepare(*args, **kwargs)
+
+    for _ in range(benchmark.warmup):
+        f(*args, **kwargs)
+
+    memory = None
+    if benchmark.memory:
+        _, memory = trace_memory(f, args, kwargs)
+
+    deadline = (
+        time.perf_counter_ns() + int(benchmark.budget * 1e9)
+        if benchmark.budget is not None
+        else None
+    )
+
+    result, samples, counters = None, [], None
+    while len(samples) < max(benchmark.repeat, 1):
+        with counting() if benchmark.counters else nullcontext() as stats:
+            start = time.perf_counter_ns()
+            result = f(*args, **kwargs)
+            end = time.perf_counter_ns()
+        samples.append(end - start)
+        if stats is not None:
+            counters = dict(stats)
+
+        if deadline is not None and end >= deadline:
+            break
+
+    timing = Timing(
+        name=name or f.__qualname__,
+        samples=samples,
+        warmup=benchmark.warmup,
+        memory=memory,
+        counters=counters,
+    )
+    return result, timing
+
+
+def batch(f, inputs: Iterable[Any], **kwargs) -> Generator[Any, None, None]:
+    """Call a solver's `main` on each input in turn, yielding answers as they're ready.
+
+    Goes around the `time_it` wrapper (no per-input timing or printing). Whatever the
+    solver builds at module level or caches (lookup tables, compiled programs, path
+    tables) is built for the first input and reused by the rest.
+    """
+    solve = getattr(f, "__wrapped__", f)
+    for data in inputs:
+        yield solve(data, **kwargs)
+
+
+# how many of its most recent `Timing`s a `time_it`-decorated function keeps
+TIMINGS_KEPT = 100
+
+
+def time_it(
+    f=None,
+    *,
+    repeat: Optional[int] = None,
+    warmup: int = 0,
+    budget: Optional[float] = None,
+    memory: bool = False,
+    files: Tuple[str, ...] = (),
+    keep: int = TIMINGS_KEPT,
+    prepare: Optional[Callable] = None,
+):
+    """Time a function, printing the result.
+
+    Works bare (`@time_it`) or with benchmark settings (`@time_it(repeat=20)`,
+    `@time_it(memory=True)` to also record what the call allocates).
+    A `benchmarking()` block or the `AOC_BENCHMARK` env var overrides the
+    settings for every decorated function. The structured record for the most
+    recent call is kept on `inner.last_timing`, and the last `keep` of them on
+    `inner.timings` (a bounded deque, so long-running callers don't pile them up).
+
+    When a result cache is active (see `cache.caching`), a hit skips the call
+    entirely and a miss is stored after it's been timed. Entry points reading
+    their input from a path name that argument in `files` (`@time_it(files=("fp",))`),
+    so the cache is keyed on the file rather than the path.
+
+    Solvers that cache tables across calls (`lru_cache`d lookup tables, compiled
+    programs) pass a `prepare` callable taking the same arguments; it's called
+    untimed before the first sample, so a timing doesn't depend on what ran before.
+    """
+    if f is None:
+        return lambda fn: time_it(
+            fn, repeat=repeat, warmup=warmup, budget=budget, memory=memory, files=files, keep=keep,
+            prepare=prepare,
+        )
+
+    own = Benchmark(repeat=repeat or 1, warmup=warmup, budget=budget, memory=memory)
+
+    @wraps(f)
+    def inner(*args, **kwargs):
+        benchmark = _benchmark or own
+        name = f"{f.__module__}.{f.__qualname__}"
+
+        results, key = cache.active, None
+        if results is not None:
+            start = time.perf_counter_ns()
+            key = results.key(f, args, kwargs, files=files)
+            result = results.get(key) if key is not None else cache.MISSING
+            timing = Timing(name=name, samples=[time.perf_counter_ns() - start], cached=True)
+        if key is None or result is cache.MISSING:
+            result, timing = measure(f, args, kwargs, benchmark, name=name, prepare=prepare)
+            if key is not None:
+                results.put(key, result)
+
+        inner.last_timing = timing
+        inner.timings.append(timing)
+
+        if not benchmark.quiet:
+            print(timing)
         return result
+
+    inner.last_timing = None
+    inner.timings = deque(maxlen=keep)
     return inner